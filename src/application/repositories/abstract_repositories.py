@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from src.domain.entities import Vehicle, ParkingSpot, ParkingSession
 
@@ -9,6 +9,10 @@ class AbstractVehicleRepository(ABC):
     async def get_by_license_plate(self, license_plate: str) -> Optional[Vehicle]:
         pass
 
+    @abstractmethod
+    async def get_with_active_session(self, license_plate: str) -> Tuple[Optional[Vehicle], bool]:
+        pass
+
     @abstractmethod
     async def add(self, vehicle: Vehicle) -> Vehicle:
         pass
@@ -51,6 +55,10 @@ class AbstractParkingSpotRepository(ABC):
     async def get_occupied_spots_count(self) -> int:
         pass
 
+    @abstractmethod
+    async def get_occupancy_by_floor(self) -> List[dict]:
+        pass
+
     @abstractmethod
     async def get_floor_distribution(self, active_only: bool = True) -> dict:
         pass
@@ -1,6 +1,20 @@
-from typing import List, Dict
+import time
+from typing import List, Dict, Optional
 
 from src.application.repositories import AbstractVehicleRepository, AbstractParkingSessionRepository, AbstractParkingSpotRepository
+from src.shared.ttl_cache import TTLCache
+
+# Seconds a cached read stays fresh; vehicle entries/exits invalidate it early.
+CACHE_TTL_SECONDS = 15
+DISTRIBUTION_TTL_SECONDS = 30
+HOURLY_OCCUPANCY_TTL_SECONDS = 60
+
+NANOSECONDS_PER_DAY = 86_400_000_000_000
+
+
+def today_utc_epoch_day() -> int:
+    """Days since the Unix epoch for the current UTC date."""
+    return time.time_ns() // NANOSECONDS_PER_DAY
 
 
 class AnalyticsService:
@@ -8,11 +22,18 @@ class AnalyticsService:
         self,
         vehicle_repo: AbstractVehicleRepository,
         parking_session_repo: AbstractParkingSessionRepository,
-        parking_spot_repo: AbstractParkingSpotRepository
+        parking_spot_repo: AbstractParkingSpotRepository,
+        cache: Optional[TTLCache] = None
     ):
         self.vehicle_repo = vehicle_repo
         self.parking_session_repo = parking_session_repo
         self.parking_spot_repo = parking_spot_repo
+        self.cache = cache
+
+    async def _cached(self, key: str, compute, ttl: float = CACHE_TTL_SECONDS):
+        if self.cache is None:
+            return await compute()
+        return await self.cache.cached_async(f"analytics:{key}", ttl, compute)
 
     async def get_revenue_last_hours(self, hours: int = 1) -> float:
         return await self.parking_session_repo.get_revenue_last_hours(hours)
@@ -21,7 +42,7 @@ class AnalyticsService:
         return await self.vehicle_repo.count_by_color(color, active_only)
 
     async def get_current_vehicle_count(self) -> int:
-        return await self.parking_session_repo.get_current_vehicle_count()
+        return await self._cached("get_current_vehicle_count", self.parking_session_repo.get_current_vehicle_count)
 
     async def get_daily_average_vehicles(self, days: int = 30) -> float:
         return await self.parking_session_repo.get_daily_average_vehicles(days)
@@ -33,16 +54,32 @@ class AnalyticsService:
         return await self.parking_session_repo.get_average_duration_by_color(color)
 
     async def get_hourly_occupancy(self) -> List[Dict]:
-        return await self.parking_session_repo.get_hourly_occupancy()
+        return await self._cached(
+            "get_hourly_occupancy",
+            self.parking_session_repo.get_hourly_occupancy,
+            ttl=HOURLY_OCCUPANCY_TTL_SECONDS
+        )
 
     async def get_revenue_by_day(self, days: int = 7) -> List[Dict]:
-        return await self.parking_session_repo.get_revenue_by_day(days)
+        # Keyed by the current UTC day so the window moves at midnight
+        return await self._cached(
+            f"get_revenue_by_day:{days}:{today_utc_epoch_day()}",
+            lambda: self.parking_session_repo.get_revenue_by_day(days)
+        )
 
     async def get_brand_distribution(self, active_only: bool = True) -> Dict[str, int]:
-        return await self.vehicle_repo.get_brand_distribution(active_only)
+        return await self._cached(
+            f"get_brand_distribution:{active_only}",
+            lambda: self.vehicle_repo.get_brand_distribution(active_only),
+            ttl=DISTRIBUTION_TTL_SECONDS
+        )
 
     async def get_floor_distribution(self, active_only: bool = True) -> Dict[int, int]:
-        return await self.parking_spot_repo.get_floor_distribution(active_only)
+        return await self._cached(
+            f"get_floor_distribution:{active_only}",
+            lambda: self.parking_spot_repo.get_floor_distribution(active_only),
+            ttl=DISTRIBUTION_TTL_SECONDS
+        )
 
     async def get_parking_analytics(self) -> Dict:
-        return await self.parking_session_repo.get_parking_analytics()
\ No newline at end of file
+        return await self._cached("get_parking_analytics", self.parking_session_repo.get_parking_analytics)
\ No newline at end of file
@@ -1,10 +1,18 @@
 from datetime import datetime, timezone
-from typing import Optional, List, Dict
+from typing import Callable, Optional, List, Dict
 from loguru import logger
 
 from src.application.repositories import AbstractVehicleRepository, AbstractParkingSpotRepository, AbstractParkingSessionRepository
 from src.domain.common import SpotType, PaymentStatus
 from src.domain.entities import Vehicle, ParkingSession
+from src.shared.ttl_cache import TTLCache
+
+# Seconds a cached status stays fresh; vehicle entries/exits invalidate it early.
+CACHE_TTL_SECONDS = 15
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
 
 
 class ParkingService:
@@ -12,21 +20,28 @@ class ParkingService:
         self,
         vehicle_repo: AbstractVehicleRepository,
         parking_spot_repo: AbstractParkingSpotRepository,
-        parking_session_repo: AbstractParkingSessionRepository
+        parking_session_repo: AbstractParkingSessionRepository,
+        cache: Optional[TTLCache] = None,
+        clock: Callable[[], datetime] = utc_now
     ):
         self.vehicle_repo = vehicle_repo
         self.parking_spot_repo = parking_spot_repo
         self.parking_session_repo = parking_session_repo
+        self.cache = cache
+        # Source of entry/exit timestamps; tests inject a fixed clock instead of patching datetime
+        self.clock = clock
+
+    def _invalidate_cache(self):
+        if self.cache is not None:
+            self.cache.invalidate()
 
-    async def register_vehicle_entry(self, license_plate: str, color: str, brand: str, spot_type: SpotType) -> ParkingSession:
-        # Check if vehicle already in parking
-        existing_session = await self.parking_session_repo.get_active_session_by_license_plate(license_plate)
-        if existing_session:
+    async def register_vehicle_entry(self, license_plate: str, color: str, brand: str, spot_type: SpotType, entry_time: Optional[datetime] = None) -> ParkingSession:
+        # Find the vehicle and check it is not already in the parking
+        vehicle, already_parked = await self.vehicle_repo.get_with_active_session(license_plate)
+        if already_parked:
             raise ValueError(f"Vehicle {license_plate} is already in the parking")
 
-        # Find or create vehicle
-        vehicle = await self.vehicle_repo.get_by_license_plate(license_plate)
-        
+        # Create vehicle on first visit
         if not vehicle:
             vehicle = Vehicle(
                 license_plate=license_plate,
@@ -45,7 +60,7 @@ class ParkingService:
         session = ParkingSession(
             vehicle_id=vehicle.id,
             parking_spot_id=available_spot.id,
-            entry_time=datetime.now(timezone.utc),
+            entry_time=entry_time or self.clock(),
             hourly_rate=5.0 # Assuming a default hourly rate for now, this should come from somewhere else
         )
         
@@ -55,8 +70,9 @@ class ParkingService:
         # Mark spot as occupied
         available_spot.is_occupied = True
         await self.parking_spot_repo.update(available_spot)
+        self._invalidate_cache()
         
-        logger.info(f"Vehicle {license_plate} entered at spot {new_session.parking_spot.spot_number}")
+        logger.info("Vehicle {} entered at spot {}", license_plate, new_session.parking_spot.spot_number)
         return new_session
 
     async def register_vehicle_exit(self, license_plate: str) -> ParkingSession:
@@ -67,7 +83,7 @@ class ParkingService:
             raise ValueError(f"No active session for vehicle {license_plate}")
 
         # Calculate payment
-        session.exit_time = datetime.now(timezone.utc)
+        session.exit_time = self.clock()
         # Ensure both datetimes are timezone-aware before subtraction
         entry_time_aware = session.entry_time.replace(tzinfo=timezone.utc) if session.entry_time.tzinfo is None else session.entry_time
         exit_time_aware = session.exit_time.replace(tzinfo=timezone.utc) if session.exit_time.tzinfo is None else session.exit_time
@@ -79,42 +95,38 @@ class ParkingService:
         session.amount_paid = round(duration_hours * session.hourly_rate, 2)
         session.payment_status = PaymentStatus.PAID
 
-        # Free up parking spot
-        spot = await self.parking_spot_repo.get_by_id(session.parking_spot_id)
+        # Free up parking spot (loaded together with the session)
+        spot = session.parking_spot
         if spot: # Ensure spot exists before updating
             spot.is_occupied = False
             await self.parking_spot_repo.update(spot)
         
         session = await self.parking_session_repo.update(session)
+        self._invalidate_cache()
         
-        logger.info(f"Vehicle {license_plate} exited. Amount: ${session.amount_paid}")
+        logger.info("Vehicle {} exited. Amount: ${}", license_plate, session.amount_paid)
         return session
 
     async def get_parking_status(self) -> Dict:
-        all_spots = await self.parking_spot_repo.get_all()
-        total_spots = len(all_spots)
-        
-        occupied_spots_list = [spot for spot in all_spots if spot.is_occupied]
-        occupied_spots = len(occupied_spots_list)
-        
-        # Floor breakdown
-        floor_stats = {}
-        for spot in all_spots:
-            if spot.floor not in floor_stats:
-                floor_stats[spot.floor] = {"total": 0, "occupied": 0}
-            floor_stats[spot.floor]["total"] += 1
-            if spot.is_occupied:
-                floor_stats[spot.floor]["occupied"] += 1
+        if self.cache is None:
+            return await self._compute_parking_status()
+        return await self.cache.cached_async("parking:get_parking_status", CACHE_TTL_SECONDS, self._compute_parking_status)
+
+    async def _compute_parking_status(self) -> Dict:
+        # Totals are derived from the per-floor rows: one query instead of three
+        floor_rows = await self.parking_spot_repo.get_occupancy_by_floor()
         
-        floors = []
-        for floor_num in sorted(floor_stats.keys()):
-            stats = floor_stats[floor_num]
-            floors.append({
-                "floor": floor_num,
-                "total": stats["total"],
-                "occupied": stats["occupied"],
-                "available": stats["total"] - stats["occupied"]
-            })
+        floors = [
+            {
+                "floor": row["floor"],
+                "total": row["total"],
+                "occupied": row["occupied"],
+                "available": row["total"] - row["occupied"]
+            }
+            for row in floor_rows
+        ]
+        total_spots = sum(floor["total"] for floor in floors)
+        occupied_spots = sum(floor["occupied"] for floor in floors)
         
         available_spots = total_spots - occupied_spots
         occupancy_rate = (occupied_spots / total_spots * 100) if total_spots > 0 else 0
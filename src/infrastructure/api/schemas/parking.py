@@ -88,7 +88,7 @@ class ParkingSessionResponse(ParkingSessionBase):
             return dt.replace(tzinfo=timezone.utc)
         return dt
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class PaymentInfo(BaseModel):
@@ -100,6 +100,8 @@ class PaymentInfo(BaseModel):
     amount_due: float
     spot_number: str
 
+    model_config = ConfigDict(defer_build=True)
+
     @field_validator('license_plate')
     def validate_license_plate(cls, v):  # pylint: disable=no-self-argument
         return v.upper().strip()
@@ -112,6 +114,8 @@ class ParkingStatus(BaseModel):
     occupancy_rate: float
     floors: List[dict]
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class ParkingAnalytics(BaseModel):
     total_revenue: float
@@ -120,3 +124,5 @@ class ParkingAnalytics(BaseModel):
     current_occupancy: int
     peak_hours: List[dict]
     revenue_by_day: List[dict]
+
+    model_config = ConfigDict(defer_build=True)
@@ -2,12 +2,14 @@ import os
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import re
+from typing import Any, Dict
 
 from crewai import Agent, Task, Crew
 from langchain.tools import Tool
 from langchain_openai import ChatOpenAI
 
 from src.infrastructure.persistence.database import AsyncSessionLocal
+from src.shared.ttl_cache import cached, stats_cache
 from src.application.services.analytics_service import AnalyticsService
 from src.application.services.parking_service import ParkingService
 from src.infrastructure.persistence.sqlalchemy_repositories.sqlalchemy_repositories import (
@@ -16,6 +18,18 @@ from src.infrastructure.persistence.sqlalchemy_repositories.sqlalchemy_repositor
     SQLAlchemyParkingSessionRepository,
 )
 
+# Seconds each tool answer stays fresh; entries/exits invalidate the cache early.
+_TTL_TOTAL_PARKED = 2
+_TTL_AVAILABLE_SPOTS = 5
+_TTL_COUNT_BY_COLOR = 2
+_TTL_BRAND_DISTRIBUTION = 5
+_TTL_PARKING_OVERVIEW = 5
+
+# Brand names the LLM sometimes passes to the color tool by mistake.
+_NOT_A_COLOR = frozenset({
+    "toyota", "honda", "ford", "bmw", "mercedes", "audi", "vw", "kia", "hyundai", "nissan",
+})
+
 def run_async_in_sync(coro):
     """Run async coroutine in a sync context safely."""
     def run_in_thread():
@@ -38,7 +52,7 @@ def get_total_parked_vehicles() -> str:
             analytics = AnalyticsService(None, s_repo, None)
             count = await analytics.get_current_vehicle_count()
             return f"There are currently {count} vehicles parked."
-    return run_async_in_sync(_get())
+    return cached("get_total_parked_vehicles", _TTL_TOTAL_PARKED, lambda: run_async_in_sync(_get()))
 
 def get_available_parking_spots() -> str:
     async def _get():
@@ -47,16 +61,20 @@ def get_available_parking_spots() -> str:
             service = ParkingService(None, p_repo, None)
             status = await service.get_parking_status()
             return f"There are {status['available_spots']} spots available out of {status['total_spots']} total."
-    return run_async_in_sync(_get())
+    return cached("get_available_parking_spots", _TTL_AVAILABLE_SPOTS, lambda: run_async_in_sync(_get()))
 
 def count_vehicles_by_color(color: str) -> str:
+    c = color.strip().lower()
+    if c in _NOT_A_COLOR:
+        return f"'{color}' is a brand, not a color. Use get_brand_distribution for brands."
+
     async def _get():
         async with AsyncSessionLocal() as db:
             v_repo = SQLAlchemyVehicleRepository(db)
             analytics = AnalyticsService(v_repo, None, None)
-            count = await analytics.count_vehicles_by_color(color, active_only=True)
-            return f"There are {count} {color} cars parked."
-    return run_async_in_sync(_get())
+            count = await analytics.count_vehicles_by_color(c, active_only=True)
+            return f"There are {count} {c} cars parked."
+    return cached(f"count_vehicles_by_color:{c}", _TTL_COUNT_BY_COLOR, lambda: run_async_in_sync(_get()))
 
 def get_brand_distribution() -> str:
     async def _get():
@@ -67,13 +85,65 @@ def get_brand_distribution() -> str:
             if not dist:
                 return "No brand data available for currently parked vehicles."
             return "Brand Distribution:\n" + "\n".join([f"- {brand}: {count}" for brand, count in dist.items()])
-    return run_async_in_sync(_get())
+    return cached("get_brand_distribution", _TTL_BRAND_DISTRIBUTION, lambda: run_async_in_sync(_get()))
+
+# --- Compound facts ---
+async def _fact_parking_status(db) -> Dict:
+    return await ParkingService(None, SQLAlchemyParkingSpotRepository(db), None, cache=stats_cache).get_parking_status()
+
+async def _fact_parking_analytics(db) -> Dict:
+    s_repo = SQLAlchemyParkingSessionRepository(db, session_factory=AsyncSessionLocal)
+    return await AnalyticsService(None, s_repo, None, cache=stats_cache).get_parking_analytics()
+
+_FACTS = {
+    "parking_status": _fact_parking_status,
+    "parking_analytics": _fact_parking_analytics,
+}
+
+async def _bulk_facts(keys: set[str]) -> Dict[str, Any]:
+    """Fetch several independent facts concurrently.
+
+    Each fact gets its own session because an AsyncSession cannot run
+    statements concurrently.
+    """
+    async def _one(key: str):
+        async with AsyncSessionLocal() as db:
+            return await _FACTS[key](db)
+
+    ordered = sorted(keys)
+    values = await asyncio.gather(*(_one(key) for key in ordered))
+    return dict(zip(ordered, values))
+
+def get_parking_overview() -> str:
+    def _get():
+        facts = run_async_in_sync(_bulk_facts({"parking_status", "parking_analytics"}))
+        status = facts["parking_status"]
+        analytics = facts["parking_analytics"]
+        return (
+            f"{analytics['current_occupancy']} vehicles parked, {status['available_spots']} of "
+            f"{status['total_spots']} spots available ({status['occupancy_rate']}% occupied). "
+            f"Today's revenue: ${analytics['today_revenue']:.2f} from {analytics['today_vehicles']} vehicles."
+        )
+    return cached("get_parking_overview", _TTL_PARKING_OVERVIEW, _get)
 
 # --- Tool definitions ---
-tool_total_parked = Tool(name="get_total_parked_vehicles", func=lambda _: get_total_parked_vehicles(), description="Use to get the total number of vehicles currently parked.")
-tool_available_spots = Tool(name="get_available_parking_spots", func=lambda _: get_available_parking_spots(), description="Use to find out how many parking spots are currently available.")
-tool_count_by_color = Tool(name="count_vehicles_by_color", func=lambda color: count_vehicles_by_color(color), description="Use to count parked vehicles of a specific color.")
-tool_brand_distribution = Tool(name="get_brand_distribution", func=lambda _: get_brand_distribution(), description="Use to see the breakdown of car brands currently parked.")
+# Built once at import and shared by every ParkingAssistant instance.
+_TOOL_SPECS = (
+    ("get_total_parked_vehicles", lambda _: get_total_parked_vehicles(), "Use to get the total number of vehicles currently parked."),
+    ("get_available_parking_spots", lambda _: get_available_parking_spots(), "Use to find out how many parking spots are currently available."),
+    ("count_vehicles_by_color", lambda color: count_vehicles_by_color(color), "Use to count parked vehicles of a specific color."),
+    ("get_brand_distribution", lambda _: get_brand_distribution(), "Use to see the breakdown of car brands currently parked."),
+    ("get_parking_overview", lambda _: get_parking_overview(), "Use to get occupancy, availability and today's revenue in one answer."),
+)
+TOOLS = [Tool(name=name, func=func, description=description) for name, func, description in _TOOL_SPECS]
+TOOLS_BY_NAME = {tool.name: tool for tool in TOOLS}
+(
+    tool_total_parked,
+    tool_available_spots,
+    tool_count_by_color,
+    tool_brand_distribution,
+    tool_parking_overview,
+) = TOOLS
 
 class ParkingAssistant:
     def __init__(self):
@@ -88,6 +158,16 @@ class ParkingAssistant:
         else:
             raise ValueError("No valid LLM configuration found.")
 
+        self.tools = TOOLS
+        self._crews: Dict[str, Crew] = {}
+
+    def get_tool(self, name: str) -> Tool:
+        """Return the tool registered under `name`."""
+        try:
+            return TOOLS_BY_NAME[name]
+        except KeyError:
+            raise ValueError(f"Tool '{name}' not found") from None
+
     def _select_tool_and_input(self, query: str) -> (Tool, str):
         """Selects the right tool and determines the input based on the user's query."""
         query = query.lower()
@@ -99,6 +179,9 @@ class ParkingAssistant:
         if "brand" in query or "repartition" in query:
             return tool_brand_distribution, query
 
+        if "status" in query or "overview" in query:
+            return tool_parking_overview, query
+
         if "available" in query or "spots" in query or "places" in query:
             return tool_available_spots, query
 
@@ -107,31 +190,44 @@ class ParkingAssistant:
             
         return None, None
 
+    def _crew_for(self, tool: Tool) -> Crew:
+        """Return the single-tool crew for `tool`, building it on first use.
+
+        The agent goal and task description are templates filled in by
+        `kickoff(inputs=...)`, so the same crew serves every query.
+        """
+        crew = self._crews.get(tool.name)
+        if crew is None:
+            specialist_agent = Agent(
+                role='Parking Data Specialist',
+                goal='Execute the assigned tool to answer the query: "{query}"',
+                backstory='You are a specialist agent with a single tool. Your job is to execute it and return the result.',
+                verbose=True,
+                tools=[tool],
+                llm=self.llm,
+                max_iter=2,
+                allow_delegation=False,
+                # CrewAI's tool cache never expires; answers are cached by stats_cache instead
+                cache=False
+            )
+
+            task = Task(
+                description='Use your tool to answer the query: "{query}". The specific input for your tool is: "{tool_input}"',
+                expected_output='The direct result from executing the tool.',
+                agent=specialist_agent
+            )
+
+            crew = Crew(agents=[specialist_agent], tasks=[task], process="sequential", cache=False)
+            self._crews[tool.name] = crew
+        return crew
+
     def process_query(self, query: str) -> str:
-        """Process a user query using a dynamically created specialist agent."""
+        """Process a user query with the specialist crew for the selected tool."""
         
         selected_tool, tool_input = self._select_tool_and_input(query)
 
         if not selected_tool:
-            return "I'm sorry, I can only answer questions about the number of cars, available spots, colors, or brands."
-
-        specialist_agent = Agent(
-            role='Parking Data Specialist',
-            goal=f'Execute the assigned tool to answer the query: "{query}"',
-            backstory='You are a specialist agent with a single tool. Your job is to execute it and return the result.',
-            verbose=True,
-            tools=[selected_tool],
-            llm=self.llm,
-            max_iter=2,
-            allow_delegation=False
-        )
-
-        task = Task(
-            description=f'Use your tool to answer the query: "{query}". The specific input for your tool is: "{tool_input}"',
-            expected_output='The direct result from executing the tool.',
-            agent=specialist_agent
-        )
+            return "I'm sorry, I can only answer questions about the number of cars, available spots, colors, brands, or the overall status."
 
-        crew = Crew(agents=[specialist_agent], tasks=[task], process="sequential")
-        result = crew.kickoff()
+        result = self._crew_for(selected_tool).kickoff(inputs={"query": query, "tool_input": tool_input})
         return str(result)
@@ -0,0 +1,87 @@
+"""Statements that maintain the `daily_session_stats` and `parking_stats` roll-up tables."""
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List
+
+from sqlalchemy import Date, Insert, Select, exists, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from src.domain.common import PaymentStatus
+from src.infrastructure.persistence.models.models import DailySessionStats, ParkingSession
+
+# Dialects whose INSERT supports ON CONFLICT ... DO UPDATE
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def utc_day(value: datetime) -> date:
+    """Return the UTC calendar day of a datetime, treating naive values as local like UTCDateTime."""
+    return value.astimezone(timezone.utc).date()
+
+
+def add_to_daily_stats(dialect: str, day: date, revenue: float = 0.0, vehicles: int = 0, sessions: int = 0) -> Insert:
+    """Upsert that adds the deltas to the day's roll-up row, creating the row if needed.
+
+    The conflict clause makes concurrent writers on the same day add to one
+    row instead of racing to insert it.
+    """
+    stmt = _UPSERT_INSERTS[dialect](DailySessionStats).values(
+        date=day, revenue=revenue, vehicles=vehicles, sessions=sessions,
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[DailySessionStats.date],
+        set_={
+            column: getattr(DailySessionStats, column) + stmt.excluded[column]
+            for column in ("revenue", "vehicles", "sessions")
+        },
+    )
+
+
+def other_paid_exit_on_day(vehicle_id: int, session_id: int, day: date) -> Select:
+    """Whether the vehicle has another paid exit on the UTC day, i.e. is already counted in `vehicles`."""
+    start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+    return select(exists().where(
+        ParkingSession.vehicle_id == vehicle_id,
+        ParkingSession.id != session_id,
+        ParkingSession.payment_status == PaymentStatus.PAID,
+        ParkingSession.exit_time >= start,
+        ParkingSession.exit_time < start + timedelta(days=1),
+    ))
+
+
+def sessions_per_day() -> Select:
+    entry_day = func.date(ParkingSession.entry_time, type_=Date)
+    return select(
+        entry_day.label("date"), func.count(ParkingSession.id).label("sessions"),
+    ).group_by(entry_day)
+
+
+def payments_per_day() -> Select:
+    exit_day = func.date(ParkingSession.exit_time, type_=Date)
+    return select(
+        exit_day.label("date"),
+        func.coalesce(func.sum(ParkingSession.amount_paid), 0.0).label("revenue"),
+        func.count(func.distinct(ParkingSession.vehicle_id)).label("vehicles"),
+    ).where(
+        ParkingSession.exit_time.is_not(None),
+        ParkingSession.payment_status == PaymentStatus.PAID,
+    ).group_by(exit_day)
+
+
+def parking_stats_counts() -> Select:
+    """Full recount of the `parking_stats` counters, used to seed or heal the row."""
+    return select(
+        func.count(ParkingSession.id).filter(ParkingSession.exit_time.is_(None)).label("current_occupancy"),
+        func.count(ParkingSession.id).label("lifetime_entries"),
+    )
+
+
+def merge_daily_stats(session_rows, payment_rows) -> List[Dict]:
+    """Merge the two per-day aggregates into insertable `daily_session_stats` rows."""
+    stats: Dict[date, Dict] = {}
+    for row in session_rows:
+        stats.setdefault(row.date, {"date": row.date, "revenue": 0.0, "vehicles": 0, "sessions": 0})
+        stats[row.date]["sessions"] = row.sessions
+    for row in payment_rows:
+        stats.setdefault(row.date, {"date": row.date, "revenue": 0.0, "vehicles": 0, "sessions": 0})
+        stats[row.date]["revenue"] = float(row.revenue)
+        stats[row.date]["vehicles"] = row.vehicles
+    return list(stats.values())
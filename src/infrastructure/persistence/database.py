@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import NullPool, StaticPool
 import os
 
 from src.infrastructure.persistence.models.models import Base
@@ -14,16 +15,63 @@ if "sqlite" in DATABASE_URL:
     DATABASE_URL = f"sqlite:///{db_path}"
     ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{db_path}"
 
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune every new SQLite connection.
+
+    WAL lets the analytics reads run while an entry or exit commits, and
+    synchronous=NORMAL is durable enough in WAL mode. The mmap and cache
+    sizes keep the aggregate scans in memory.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.close()
+
+
+def create_sync_engine(url: str):
+    """Sync engine with the application's SQLite connection settings and pragmas."""
+    if "sqlite" not in url:
+        return create_engine(url)
+    sync_engine = create_engine(url, connect_args={"check_same_thread": False})
+    event.listen(sync_engine, "connect", set_sqlite_pragmas)
+    return sync_engine
+
+
 # Sync engine for initialization
-engine = create_engine(DATABASE_URL, connect_args={
-                       "check_same_thread": False} if "sqlite" in DATABASE_URL else {})
+engine = create_sync_engine(DATABASE_URL)
+
+
+
+def async_engine_options(url: str) -> dict:
+    """Pool settings for the async engine.
+
+    The Streamlit pages and the assistant tools reach the database through
+    asyncio.run / run_async_in_sync, so each render or tool call runs on a
+    fresh event loop. Async driver connections belong to the loop that
+    opened them, so pooling them across calls would hand a connection to a
+    different loop; NullPool opens and closes one per session instead. An
+    in-memory SQLite database only exists on a single connection, so it
+    gets a StaticPool.
+    """
+    if "sqlite" in url and ":memory:" in url:
+        return {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+    return {"poolclass": NullPool}
+
 
 # Async engine for application
-async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=False)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=False, **async_engine_options(ASYNC_DATABASE_URL))
 AsyncSessionLocal = async_sessionmaker(
     async_engine, class_=AsyncSession, expire_on_commit=False)
 
 
+if "sqlite" in DATABASE_URL:
+    event.listen(async_engine.sync_engine, "connect", set_sqlite_pragmas)
+
+
 async def get_async_db():
     async with AsyncSessionLocal() as session:
         try:
@@ -32,30 +80,77 @@ async def get_async_db():
             await session.close()
 
 
-def init_db():
-    print(f"Initializing database at: {DATABASE_URL}")
+def init_db(engine=engine):
+    print(f"Initializing database at: {engine.url}")
     Base.metadata.create_all(bind=engine, checkfirst=True)
+    _add_color_lc_column(engine)
+    # create_all skips indexes of tables that already exist; add any missing ones
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
     print("Tables created")
 
     # Create initial parking spots
+    from sqlalchemy import insert
     from sqlalchemy.orm import Session
-    from src.infrastructure.persistence.models.models import ParkingSpot
+    from src.infrastructure.persistence.models.models import ParkingSpot, ParkingStats
 
     with Session(engine) as session:
         # Check if spots already exist
         existing_spots = session.query(ParkingSpot).count()
         if existing_spots == 0:
-            # Create 3 floors with 20 spots each
-            for floor in range(1, 4):
-                for spot_num in range(1, 21):
-                    spot_number = f"{floor}-{spot_num:02d}"
-                    spot_type = "disabled" if spot_num <= 2 else "vip" if spot_num <= 5 else "regular"
-                    spot = ParkingSpot(
-                        spot_number=spot_number,
-                        floor=floor,
-                        spot_type=spot_type,
-                        is_occupied=False
-                    )
-                    session.add(spot)
+            # Create 3 floors with 20 spots each, in one executemany
+            session.execute(insert(ParkingSpot), [
+                {
+                    "spot_number": f"{floor}-{spot_num:02d}",
+                    "floor": floor,
+                    "spot_type": "disabled" if spot_num <= 2 else "vip" if spot_num <= 5 else "regular",
+                    "is_occupied": False,
+                }
+                for floor in range(1, 4)
+                for spot_num in range(1, 21)
+            ])
             session.commit()
             print(f"Created {3 * 20} parking spots")
+        stats_seeded = session.get(ParkingStats, 1) is not None
+
+    # The Home page calls init_db on every rerun, so only seed the roll-ups of a new
+    # or pre-roll-up database; src/init_database.py runs the full rebuild on demand.
+    if not stats_seeded:
+        refresh_daily_session_stats(engine)
+
+
+def _add_color_lc_column(engine):
+    """Add and backfill `vehicles.color_lc` on databases created before the column existed."""
+    from sqlalchemy import inspect, text
+
+    with engine.begin() as conn:
+        columns = {column["name"] for column in inspect(conn).get_columns("vehicles")}
+        if "color_lc" not in columns:
+            conn.execute(text("ALTER TABLE vehicles ADD COLUMN color_lc VARCHAR"))
+        conn.execute(text("UPDATE vehicles SET color_lc = lower(trim(color)) WHERE color_lc IS NULL"))
+
+
+def refresh_daily_session_stats(engine=engine):
+    """Rebuild the `daily_session_stats` roll-up and `parking_stats` counters from the parking sessions.
+
+    The repository keeps the table current on every write; this full refresh
+    heals it for databases created before the table existed or edited by hand.
+    """
+    from sqlalchemy import delete, insert
+    from sqlalchemy.orm import Session
+    from src.infrastructure.persistence.daily_stats import sessions_per_day, payments_per_day, merge_daily_stats, parking_stats_counts
+    from src.infrastructure.persistence.models.models import DailySessionStats, ParkingStats
+
+    with Session(engine) as session:
+        rows = merge_daily_stats(
+            session.execute(sessions_per_day()).all(),
+            session.execute(payments_per_day()).all(),
+        )
+        session.execute(delete(DailySessionStats))
+        if rows:
+            session.execute(insert(DailySessionStats), rows)
+        counts = session.execute(parking_stats_counts()).one()
+        session.execute(delete(ParkingStats))
+        session.execute(insert(ParkingStats).values(id=1, **counts._asdict()))
+        session.commit()
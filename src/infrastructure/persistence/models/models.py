@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, Date, Index, CheckConstraint
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from src.shared.custom_types import UTCDateTime # Updated import path
 
 Base = declarative_base()
@@ -13,11 +13,17 @@ class Vehicle(Base):
     id = Column(Integer, primary_key=True, index=True)
     license_plate = Column(String, unique=True, index=True)
     color = Column(String, nullable=False)
+    color_lc = Column(String, index=True)  # trimmed, lower-cased color for indexed lookups
     brand = Column(String, nullable=False)
     created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
 
     parking_sessions = relationship("ParkingSession", back_populates="vehicle")
 
+    @validates("color")
+    def _sync_color_lc(self, key, color):
+        self.color_lc = color.strip().lower() if color is not None else None
+        return color
+
 
 class ParkingSpot(Base):
     __tablename__ = "parking_spots"
@@ -30,6 +36,11 @@ class ParkingSpot(Base):
 
     parking_sessions = relationship("ParkingSession", back_populates="parking_spot")
 
+    __table_args__ = (
+        # Free-spot lookup on vehicle entry
+        Index("ix_spot_occupied_type", "is_occupied", "spot_type"),
+    )
+
 
 class ParkingSession(Base):
     __tablename__ = "parking_sessions"
@@ -46,6 +57,17 @@ class ParkingSession(Base):
     vehicle = relationship("Vehicle", back_populates="parking_sessions")
     parking_spot = relationship("ParkingSpot", back_populates="parking_sessions")
 
+    __table_args__ = (
+        # Revenue windows filter on paid exits, vehicle counts on entry time
+        Index("ix_session_exit_paid", "exit_time", "payment_status"),
+        Index("ix_session_entry", "entry_time"),
+        # Partial index over parked vehicles only, for occupancy and active-session reads
+        Index(
+            "ix_session_active_entry", "entry_time",
+            sqlite_where=exit_time.is_(None), postgresql_where=exit_time.is_(None)
+        ),
+    )
+
     @property
     def duration_hours(self):
         if self.exit_time:
@@ -69,4 +91,27 @@ class ParkingSession(Base):
             "amount_paid": self.amount_paid,
             "payment_status": self.payment_status,
             "hourly_rate": self.hourly_rate,
-        }
\ No newline at end of file
+        }
+
+
+class DailySessionStats(Base):
+    """Per-day roll-up of parking sessions, kept in sync by the session repository."""
+    __tablename__ = "daily_session_stats"
+
+    date = Column(Date, primary_key=True)
+    revenue = Column(Float, nullable=False, default=0.0)  # paid amounts by exit day
+    vehicles = Column(Integer, nullable=False, default=0)  # distinct paying vehicles by exit day
+    sessions = Column(Integer, nullable=False, default=0)  # sessions started by entry day
+
+
+class ParkingStats(Base):
+    """Single-row running counters, updated in the same transaction as entries and exits."""
+    __tablename__ = "parking_stats"
+
+    id = Column(Integer, primary_key=True, default=1)
+    current_occupancy = Column(Integer, nullable=False, default=0)  # sessions without an exit time
+    lifetime_entries = Column(Integer, nullable=False, default=0)  # sessions ever started
+
+    __table_args__ = (
+        CheckConstraint("id = 1", name="ck_parking_stats_single_row"),
+    )
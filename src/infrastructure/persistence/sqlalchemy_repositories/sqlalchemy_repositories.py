@@ -1,13 +1,15 @@
-from typing import List, Optional, Dict
+import asyncio
+from typing import List, Optional, Dict, Tuple
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_, extract, update
-from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import select, func, and_, or_, extract, update, literal, insert, case, exists, cast, String, union_all
+from sqlalchemy.orm import selectinload, joinedload, contains_eager
 
 from src.domain.entities import Vehicle, ParkingSpot, ParkingSession
 from src.domain.common import PaymentStatus
-from src.infrastructure.persistence.models.models import Vehicle as ORMVehicle, ParkingSpot as ORMParkingSpot, ParkingSession as ORMParkingSession
+from src.infrastructure.persistence.models.models import Vehicle as ORMVehicle, ParkingSpot as ORMParkingSpot, ParkingSession as ORMParkingSession, DailySessionStats, ParkingStats
+from src.infrastructure.persistence.daily_stats import utc_day, add_to_daily_stats, other_paid_exit_on_day, parking_stats_counts
 from src.application.repositories import AbstractVehicleRepository, AbstractParkingSpotRepository, AbstractParkingSessionRepository
 
 
@@ -17,7 +19,7 @@ class SQLAlchemyVehicleRepository(AbstractVehicleRepository):
 
     async def get_by_license_plate(self, license_plate: str) -> Optional[Vehicle]:
         result = await self.session.execute(
-            select(ORMVehicle).where(ORMVehicle.license_plate == license_plate.upper())
+            select(ORMVehicle).where(ORMVehicle.license_plate == license_plate.upper()).limit(1)
         )
         orm_vehicle = result.scalars().first()
         if orm_vehicle:
@@ -30,6 +32,31 @@ class SQLAlchemyVehicleRepository(AbstractVehicleRepository):
             )
         return None
 
+    async def get_with_active_session(self, license_plate: str) -> Tuple[Optional[Vehicle], bool]:
+        """Return the vehicle for a plate and whether it is currently parked, in one query."""
+        active = exists().where(
+            and_(
+                ORMParkingSession.vehicle_id == ORMVehicle.id,
+                ORMParkingSession.exit_time.is_(None)
+            )
+        )
+        result = await self.session.execute(
+            select(ORMVehicle, active.label('active'))
+            .where(ORMVehicle.license_plate == license_plate.upper())
+            .limit(1)
+        )
+        row = result.first()
+        if row is None:
+            return None, False
+        orm_vehicle = row[0]
+        return Vehicle(
+            id=orm_vehicle.id,
+            license_plate=orm_vehicle.license_plate,
+            color=orm_vehicle.color,
+            brand=orm_vehicle.brand,
+            created_at=orm_vehicle.created_at
+        ), bool(row.active)
+
     async def add(self, vehicle: Vehicle) -> Vehicle:
         orm_vehicle = ORMVehicle(
             license_plate=vehicle.license_plate,
@@ -50,7 +77,7 @@ class SQLAlchemyVehicleRepository(AbstractVehicleRepository):
     async def count_by_color(self, color: str, active_only: bool = True) -> int:
         query = select(func.count(func.distinct(ORMVehicle.id))).select_from(ORMVehicle).join(ORMParkingSession)
         
-        conditions = [ORMVehicle.color.ilike(f"%{color}%")]
+        conditions = [ORMVehicle.color_lc == color.strip().lower()]
         if active_only:
             conditions.append(ORMParkingSession.exit_time.is_(None))
         
@@ -76,7 +103,7 @@ class SQLAlchemyVehicleRepository(AbstractVehicleRepository):
         result = await self.session.execute(
             select(ORMVehicle).where(ORMVehicle.id == vehicle_id)
         )
-        orm_vehicle = result.scalars().first()
+        orm_vehicle = result.scalar_one_or_none()
         if orm_vehicle:
             return Vehicle(
                 id=orm_vehicle.id,
@@ -98,7 +125,7 @@ class SQLAlchemyParkingSpotRepository(AbstractParkingSpotRepository):
                 ORMParkingSpot.is_occupied == False,
                 ORMParkingSpot.spot_type == spot_type
             )
-        ).order_by(ORMParkingSpot.floor, ORMParkingSpot.spot_number)
+        ).order_by(ORMParkingSpot.floor, ORMParkingSpot.spot_number).limit(1).with_for_update(skip_locked=True)
         
         result = await self.session.execute(spot_query)
         orm_spot = result.scalars().first()
@@ -133,14 +160,14 @@ class SQLAlchemyParkingSpotRepository(AbstractParkingSpotRepository):
         return [
             ParkingSpot(
                 id=s.id, spot_number=s.spot_number, floor=s.floor, spot_type=s.spot_type, is_occupied=s.is_occupied
-            ) for s in result.scalars().all()
+            ) for s in result.scalars()
         ]
 
     async def get_by_id(self, spot_id: int) -> Optional[ParkingSpot]:
         result = await self.session.execute(
             select(ORMParkingSpot).where(ORMParkingSpot.id == spot_id)
         )
-        orm_spot = result.scalars().first()
+        orm_spot = result.scalar_one_or_none()
         if orm_spot:
             return ParkingSpot(
                 id=orm_spot.id,
@@ -161,6 +188,16 @@ class SQLAlchemyParkingSpotRepository(AbstractParkingSpotRepository):
         )
         return result.scalar() or 0
 
+    async def get_occupancy_by_floor(self) -> List[Dict]:
+        result = await self.session.execute(
+            select(
+                ORMParkingSpot.floor,
+                func.count(ORMParkingSpot.id).label('total'),
+                func.sum(case((ORMParkingSpot.is_occupied == True, 1), else_=0)).label('occupied')
+            ).group_by(ORMParkingSpot.floor).order_by(ORMParkingSpot.floor)
+        )
+        return [{"floor": row.floor, "total": row.total, "occupied": row.occupied or 0} for row in result]
+
     async def get_floor_distribution(self, active_only: bool = True) -> Dict[int, int]:
         query = select(
             ORMParkingSpot.floor,
@@ -190,24 +227,35 @@ class SQLAlchemyParkingSpotRepository(AbstractParkingSpotRepository):
         await self.session.commit()
 
 
+def _paid_exit(exit_time, payment_status, amount_paid) -> Optional[Tuple]:
+    """The (UTC day, amount) a session contributes to the revenue roll-up, or None if it is not a paid exit."""
+    if exit_time is None or payment_status != PaymentStatus.PAID:
+        return None
+    return utc_day(exit_time), amount_paid or 0.0
+
+
 class SQLAlchemyParkingSessionRepository(AbstractParkingSessionRepository):
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, session_factory: Optional[async_sessionmaker] = None):
         self.session = session
+        # When set, independent read-only aggregates run concurrently, each on its own session.
+        self.session_factory = session_factory
 
     async def get_active_session_by_license_plate(self, license_plate: str) -> Optional[ParkingSession]:
+        # Vehicle comes from the join, parking spot is joined in the same round-trip
         result = await self.session.execute(
             select(ORMParkingSession).join(ORMVehicle).where(
                 and_(
                     ORMVehicle.license_plate == license_plate,
                     ORMParkingSession.exit_time.is_(None)
                 )
-            ).order_by(ORMParkingSession.entry_time.desc())
+            ).options(
+                contains_eager(ORMParkingSession.vehicle),
+                joinedload(ORMParkingSession.parking_spot)
+            ).order_by(ORMParkingSession.entry_time.desc()).limit(1)
         )
         orm_session = result.scalars().first()
         if orm_session:
-            # Eagerly load related vehicle and parking_spot
-            await self.session.refresh(orm_session, ["vehicle", "parking_spot"])
-            return ParkingSession(
+            domain_session = ParkingSession(
                 id=orm_session.id,
                 vehicle_id=orm_session.vehicle_id,
                 parking_spot_id=orm_session.parking_spot_id,
@@ -217,6 +265,21 @@ class SQLAlchemyParkingSessionRepository(AbstractParkingSessionRepository):
                 payment_status=orm_session.payment_status,
                 hourly_rate=orm_session.hourly_rate,
             )
+            domain_session.vehicle = Vehicle(
+                id=orm_session.vehicle.id,
+                license_plate=orm_session.vehicle.license_plate,
+                color=orm_session.vehicle.color,
+                brand=orm_session.vehicle.brand,
+                created_at=orm_session.vehicle.created_at
+            )
+            domain_session.parking_spot = ParkingSpot(
+                id=orm_session.parking_spot.id,
+                spot_number=orm_session.parking_spot.spot_number,
+                floor=orm_session.parking_spot.floor,
+                spot_type=orm_session.parking_spot.spot_type,
+                is_occupied=orm_session.parking_spot.is_occupied
+            )
+            return domain_session
         return None
 
     async def add(self, session: ParkingSession) -> ParkingSession:
@@ -228,6 +291,8 @@ class SQLAlchemyParkingSessionRepository(AbstractParkingSessionRepository):
         )
         self.session.add(orm_session)
         await self.session.flush()
+        await self._add_to_daily_stats(utc_day(orm_session.entry_time), sessions=1)
+        await self._bump_parking_stats(occupancy=1, entries=1)
         await self.session.refresh(orm_session, ["vehicle", "parking_spot"])
         
         # Convert ORM object to domain entity
@@ -260,11 +325,36 @@ class SQLAlchemyParkingSessionRepository(AbstractParkingSessionRepository):
         
         return domain_session
 
+    async def _add_to_daily_stats(self, day, revenue: float = 0.0, vehicles: int = 0, sessions: int = 0) -> None:
+        dialect = self.session.get_bind().dialect.name
+        await self.session.execute(add_to_daily_stats(dialect, day, revenue=revenue, vehicles=vehicles, sessions=sessions))
+
+    async def _apply_paid_exit(self, orm_session, paid_exit, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) a session's paid exit from its day's roll-up row."""
+        day, amount = paid_exit
+        counted = (await self.session.execute(
+            other_paid_exit_on_day(orm_session.vehicle_id, orm_session.id, day)
+        )).scalar()
+        await self._add_to_daily_stats(day, revenue=sign * amount, vehicles=0 if counted else sign)
+
+    async def _bump_parking_stats(self, occupancy: int = 0, entries: int = 0) -> None:
+        """Apply deltas to the `parking_stats` counters; seed the row from a recount if it is missing."""
+        result = await self.session.execute(
+            update(ParkingStats).where(ParkingStats.id == 1).values(
+                current_occupancy=ParkingStats.current_occupancy + occupancy,
+                lifetime_entries=ParkingStats.lifetime_entries + entries,
+            )
+        )
+        if result.rowcount == 0:
+            # The recount already sees the flushed change, so no delta is added
+            counts = (await self.session.execute(parking_stats_counts())).one()
+            await self.session.execute(insert(ParkingStats).values(id=1, **counts._asdict()))
+
     async def get_by_id(self, session_id: int) -> Optional[ParkingSession]:
         result = await self.session.execute(
             select(ORMParkingSession).where(ORMParkingSession.id == session_id)
         )
-        orm_session = result.scalars().first()
+        orm_session = result.scalar_one_or_none()
         if orm_session:
             return ParkingSession(
                 id=orm_session.id,
@@ -281,10 +371,20 @@ class SQLAlchemyParkingSessionRepository(AbstractParkingSessionRepository):
     async def update(self, session: ParkingSession) -> ParkingSession:
         orm_session = await self.session.get(ORMParkingSession, session.id)
         if orm_session:
+            old_paid_exit = _paid_exit(orm_session.exit_time, orm_session.payment_status, orm_session.amount_paid)
+            new_paid_exit = _paid_exit(session.exit_time, session.payment_status, session.amount_paid)
+            occupancy_delta = (session.exit_time is None) - (orm_session.exit_time is None)
             orm_session.exit_time = session.exit_time
             orm_session.amount_paid = session.amount_paid
             orm_session.payment_status = session.payment_status
             await self.session.flush()
+            if old_paid_exit != new_paid_exit:
+                if old_paid_exit:
+                    await self._apply_paid_exit(orm_session, old_paid_exit, sign=-1)
+                if new_paid_exit:
+                    await self._apply_paid_exit(orm_session, new_paid_exit, sign=1)
+            if occupancy_delta:
+                await self._bump_parking_stats(occupancy=occupancy_delta)
             await self.session.refresh(orm_session)
             return ParkingSession(
                 id=orm_session.id,
@@ -306,7 +406,7 @@ class SQLAlchemyParkingSessionRepository(AbstractParkingSessionRepository):
         )
         
         sessions = []
-        for s in result.scalars().all():
+        for s in result.scalars():
             domain_session = ParkingSession(
                 id=s.id, vehicle_id=s.vehicle_id, parking_spot_id=s.parking_spot_id,
                 entry_time=s.entry_time, exit_time=s.exit_time, amount_paid=s.amount_paid,
@@ -331,7 +431,7 @@ class SQLAlchemyParkingSessionRepository(AbstractParkingSessionRepository):
                 id=s.id, vehicle_id=s.vehicle_id, parking_spot_id=s.parking_spot_id,
                 entry_time=s.entry_time, exit_time=s.exit_time, amount_paid=s.amount_paid,
                 payment_status=s.payment_status, hourly_rate=s.hourly_rate
-            ) for s in result.scalars().all()
+            ) for s in result.scalars()
         ]
 
     async def get_revenue_last_hours(self, hours: int = 1) -> float:
@@ -347,169 +447,185 @@ class SQLAlchemyParkingSessionRepository(AbstractParkingSessionRepository):
         return result.scalar() or 0.0
 
     async def get_current_vehicle_count(self) -> int:
-        result = await self.session.execute(
-            select(func.count(ORMParkingSession.id)).where(
-                ORMParkingSession.exit_time.is_(None)
-            )
+        count = await self.session.scalar(
+            select(ParkingStats.current_occupancy).where(ParkingStats.id == 1)
         )
-        return result.scalar() or 0
+        if count is None:
+            # Counter row not seeded yet (no entry since the table was created)
+            result = await self.session.execute(
+                select(func.count(ORMParkingSession.id)).where(
+                    ORMParkingSession.exit_time.is_(None)
+                )
+            )
+            return result.scalar() or 0
+        return count
 
     async def get_daily_average_vehicles(self, days: int = 30) -> float:
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+        """Average sessions per active day, over whole UTC days from the cutoff day onwards."""
+        cutoff_date = (datetime.now(timezone.utc) - timedelta(days=days)).date()
         
-        daily_counts = await self.session.execute(
-            select(
-                func.date(ORMParkingSession.entry_time).label('date'),
-                func.count(ORMParkingSession.id).label('count')
-            ).where(
-                ORMParkingSession.entry_time >= cutoff_date
-            ).group_by(
-                func.date(ORMParkingSession.entry_time)
+        result = await self.session.execute(
+            select(func.avg(DailySessionStats.sessions)).where(
+                and_(
+                    DailySessionStats.date >= cutoff_date,
+                    DailySessionStats.sessions > 0
+                )
             )
         )
-        
-        counts = [row.count for row in daily_counts]
-        return sum(counts) / len(counts) if counts else 0.0
+        return float(result.scalar() or 0.0)
 
     async def get_average_daily_spending(self, days: int = 30) -> float:
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+        """Revenue per paying vehicle over whole UTC days from the cutoff day, skipping zero-revenue days."""
+        cutoff_date = (datetime.now(timezone.utc) - timedelta(days=days)).date()
         
-        daily_stats = await self.session.execute(
+        result = await self.session.execute(
             select(
-                func.date(ORMParkingSession.exit_time).label('date'),
-                func.sum(ORMParkingSession.amount_paid).label('revenue'),
-                func.count(func.distinct(ORMParkingSession.vehicle_id)).label('vehicles')
+                func.sum(DailySessionStats.revenue) / func.nullif(func.sum(DailySessionStats.vehicles), 0)
             ).where(
                 and_(
-                    ORMParkingSession.exit_time >= cutoff_date,
-                    ORMParkingSession.payment_status == PaymentStatus.PAID
+                    DailySessionStats.date >= cutoff_date,
+                    DailySessionStats.revenue > 0,
+                    DailySessionStats.vehicles > 0
                 )
-            ).group_by(
-                func.date(ORMParkingSession.exit_time)
             )
         )
-        
-        total_revenue = 0
-        total_vehicles = 0
-        for row in daily_stats:
-            if row.revenue and row.vehicles:
-                total_revenue += row.revenue
-                total_vehicles += row.vehicles
-        
-        return total_revenue / total_vehicles if total_vehicles > 0 else 0.0
+        return float(result.scalar() or 0.0)
+
+    def _duration_hours(self):
+        """SQL expression for a session's duration in hours, evaluated by the database."""
+        if self.session.get_bind().dialect.name == "sqlite":
+            return (func.julianday(ORMParkingSession.exit_time) - func.julianday(ORMParkingSession.entry_time)) * 24
+        return func.extract('epoch', ORMParkingSession.exit_time - ORMParkingSession.entry_time) / 3600
 
     async def get_average_duration_by_color(self, color: str) -> float:
         result = await self.session.execute(
-            select(ORMParkingSession.entry_time, ORMParkingSession.exit_time).select_from(ORMParkingSession).join(ORMVehicle).where(
+            select(func.avg(self._duration_hours())).select_from(ORMParkingSession).join(ORMVehicle).where(
                 and_(
-                    ORMVehicle.color.ilike(f"%{color}%"),
+                    ORMVehicle.color_lc == color.strip().lower(),
                     ORMParkingSession.exit_time.is_not(None)
                 )
             )
         )
-        durations = []
-        for entry_time, exit_time in result:
-            if entry_time and exit_time:
-                duration = (exit_time - entry_time).total_seconds() / 3600
-                durations.append(duration)
-        
-        avg_hours = sum(durations) / len(durations) if durations else 0.0
+        avg_hours = result.scalar()
         return round(avg_hours, 2) if avg_hours else 0.0
 
     async def get_hourly_occupancy(self) -> List[Dict]:
-        hourly_stats = []
-        
-        for hour in range(24):
-            result = await self.session.execute(
-                select(func.count(ORMParkingSession.id)).where(
-                    and_(
-                        extract('hour', ORMParkingSession.entry_time) <= hour,
-                        or_(
-                            ORMParkingSession.exit_time.is_(None),
-                            extract('hour', ORMParkingSession.exit_time) >= hour
-                        )
+        # One histogram query over a 0..23 recursive CTE instead of 24 round-trips
+        hours = select(literal(0).label("hour")).cte("hours", recursive=True)
+        hours = hours.union_all(select(hours.c.hour + 1).where(hours.c.hour < 23))
+
+        result = await self.session.execute(
+            select(hours.c.hour, func.count(ORMParkingSession.id).label("occupancy"))
+            .select_from(hours)
+            .outerjoin(
+                ORMParkingSession,
+                and_(
+                    extract('hour', ORMParkingSession.entry_time) <= hours.c.hour,
+                    or_(
+                        ORMParkingSession.exit_time.is_(None),
+                        extract('hour', ORMParkingSession.exit_time) >= hours.c.hour
                     )
                 )
             )
-            count = result.scalar() or 0
-            hourly_stats.append({
-                "hour": hour,
-                "occupancy": count
-            })
+            .group_by(hours.c.hour)
+            .order_by(hours.c.hour)
+        )
         
-        return hourly_stats
+        return [{"hour": row.hour, "occupancy": row.occupancy} for row in result]
 
     async def get_revenue_by_day(self, days: int = 7) -> List[Dict]:
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+        """Revenue of each day with paid exits, over whole UTC days from the cutoff day onwards."""
+        cutoff_date = (datetime.now(timezone.utc) - timedelta(days=days)).date()
         
         result = await self.session.execute(
-            select(
-                func.strftime('%Y-%m-%d', ORMParkingSession.exit_time).label('date'),
-                func.sum(ORMParkingSession.amount_paid).label('revenue')
-            ).where(
+            select(DailySessionStats.date, DailySessionStats.revenue).where(
                 and_(
-                    ORMParkingSession.exit_time >= cutoff_date,
-                    ORMParkingSession.payment_status == PaymentStatus.PAID
+                    DailySessionStats.date >= cutoff_date,
+                    DailySessionStats.vehicles > 0
                 )
-            ).group_by(
-                func.strftime('%Y-%m-%d', ORMParkingSession.exit_time)
-            ).order_by(
-                func.strftime('%Y-%m-%d', ORMParkingSession.exit_time)
-            )
+            ).order_by(DailySessionStats.date)
         )
         
-        revenue_data = []
-        for row in result:
-            
-            revenue_data.append({
-                "date": datetime.strptime(row.date, '%Y-%m-%d').date().isoformat() if row.date else None,
-                "revenue": float(row.revenue) if row.revenue else 0.0
-            })
-        return revenue_data
+        return [
+            {"date": row.date.isoformat(), "revenue": float(row.revenue)}
+            for row in result
+        ]
+
+    async def _execute_out_of_band(self, stmt) -> list:
+        async with self.session_factory() as session:
+            conn = await session.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+            result = await conn.execute(stmt)
+            return result.all()
+
+    async def _fetch_all(self, *stmts) -> List[list]:
+        """Run independent read-only statements and return their materialized rows."""
+        if self.session_factory is None:
+            return [(await self.session.execute(stmt)).all() for stmt in stmts]
+        return list(await asyncio.gather(*(self._execute_out_of_band(stmt) for stmt in stmts)))
 
     async def get_parking_analytics(self) -> Dict:
-        # Current occupancy
-        current_vehicles = await self.get_current_vehicle_count()
-        
-        # Today's revenue
         today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-        today_revenue_result = await self.session.execute(
+
+        # The four headline figures are scalar subqueries of one SELECT: a single round-trip
+        summary = select(
+            select(func.count(ORMParkingSession.id)).where(
+                ORMParkingSession.exit_time.is_(None)
+            ).scalar_subquery().label("current_occupancy"),
             select(func.sum(ORMParkingSession.amount_paid)).where(
                 and_(
                     ORMParkingSession.exit_time >= today_start,
                     ORMParkingSession.payment_status == PaymentStatus.PAID
                 )
-            )
-        )
-        today_revenue = today_revenue_result.scalar() or 0.0
-        
-        # Today's vehicle count
-        today_vehicles_result = await self.session.execute(
+            ).scalar_subquery().label("today_revenue"),
             select(func.count(ORMParkingSession.id)).where(
                 ORMParkingSession.entry_time >= today_start
-            )
-        )
-        today_vehicles = today_vehicles_result.scalar() or 0
-        
-        # Average duration today
-        avg_duration_result = await self.session.execute(
-            select(ORMParkingSession.entry_time, ORMParkingSession.exit_time).where(
+            ).scalar_subquery().label("today_vehicles"),
+            select(func.avg(self._duration_hours())).where(
                 and_(
                     ORMParkingSession.exit_time >= today_start,
                     ORMParkingSession.exit_time.is_not(None)
                 )
-            )
+            ).scalar_subquery().label("average_duration_hours"),
+        )
+        summary_rows, breakdown_rows = await self._fetch_all(
+            summary,
+            # Parked vehicles by color, brand and floor
+            self._active_breakdown(),
         )
-        durations = []
-        for entry_time, exit_time in avg_duration_result:
-            if entry_time and exit_time:
-                duration = (exit_time - entry_time).total_seconds() / 3600
-                durations.append(duration)
-        avg_duration = sum(durations) / len(durations) if durations else 0.0
+        totals = summary_rows[0]
+        current_vehicles = totals.current_occupancy or 0
+        today_revenue = totals.today_revenue or 0.0
+        today_vehicles = totals.today_vehicles or 0
+        avg_duration = totals.average_duration_hours or 0.0
+        
+        breakdown = {"color": {}, "brand": {}, "floor": {}}
+        for row in breakdown_rows:
+            breakdown[row.dim][int(row.key) if row.dim == "floor" else row.key] = row.count
         
         return {
             "current_occupancy": current_vehicles,
             "today_revenue": round(today_revenue, 2),
             "today_vehicles": today_vehicles,
-            "average_duration_hours": round(avg_duration, 2)
-        }
\ No newline at end of file
+            "average_duration_hours": round(avg_duration, 2),
+            "color_counts": breakdown["color"],
+            "brand_counts": breakdown["brand"],
+            "floor_counts": breakdown["floor"]
+        }
+
+    def _active_breakdown(self):
+        """One UNION ALL of the active-session counts grouped by color, brand and floor, tagged by `dim`."""
+        def grouped(dim, column, *joins):
+            query = select(
+                literal(dim).label("dim"),
+                cast(column, String).label("key"),
+                func.count(ORMParkingSession.id).label("count")
+            ).select_from(ORMParkingSession)
+            for target in joins:
+                query = query.join(target)
+            return query.where(ORMParkingSession.exit_time.is_(None)).group_by(column)
+
+        return union_all(
+            grouped("color", ORMVehicle.color_lc, ORMVehicle),
+            grouped("brand", ORMVehicle.brand, ORMVehicle),
+            grouped("floor", ORMParkingSpot.floor, ORMParkingSpot),
+        )
@@ -1,7 +1,5 @@
 import asyncio
 import time
-from datetime import datetime, timezone
-
 import pandas as pd
 import streamlit as st
 
@@ -14,6 +12,7 @@ from src.infrastructure.persistence.sqlalchemy_repositories.sqlalchemy_repositor
 )
 from src.application.services.analytics_service import AnalyticsService
 from src.application.services.parking_service import ParkingService
+from src.shared.ttl_cache import stats_cache
 
 
 st.set_page_config(
@@ -30,7 +29,7 @@ async def get_parking_status():
         vehicle_repo = SQLAlchemyVehicleRepository(db)
         spot_repo = SQLAlchemyParkingSpotRepository(db)
         session_repo = SQLAlchemyParkingSessionRepository(db)
-        service = ParkingService(vehicle_repo, spot_repo, session_repo)
+        service = ParkingService(vehicle_repo, spot_repo, session_repo, cache=stats_cache)
         return await service.get_parking_status()
 
 
@@ -39,16 +38,16 @@ async def get_active_sessions():
         vehicle_repo = SQLAlchemyVehicleRepository(db)
         spot_repo = SQLAlchemyParkingSpotRepository(db)
         session_repo = SQLAlchemyParkingSessionRepository(db)
-        service = ParkingService(vehicle_repo, spot_repo, session_repo)
+        service = ParkingService(vehicle_repo, spot_repo, session_repo, cache=stats_cache)
         return await service.get_active_sessions()
 
 
 async def get_analytics():
     async with AsyncSessionLocal() as db:
         vehicle_repo = SQLAlchemyVehicleRepository(db)
-        session_repo = SQLAlchemyParkingSessionRepository(db)
+        session_repo = SQLAlchemyParkingSessionRepository(db, session_factory=AsyncSessionLocal)
         spot_repo = SQLAlchemyParkingSpotRepository(db)
-        analytics = AnalyticsService(vehicle_repo, session_repo, spot_repo)
+        analytics = AnalyticsService(vehicle_repo, session_repo, spot_repo, cache=stats_cache)
         return await analytics.get_parking_analytics()
 
 
@@ -57,7 +56,7 @@ async def register_entry(vehicle_data):
         vehicle_repo = SQLAlchemyVehicleRepository(db)
         spot_repo = SQLAlchemyParkingSpotRepository(db)
         session_repo = SQLAlchemyParkingSessionRepository(db)
-        service = ParkingService(vehicle_repo, spot_repo, session_repo)
+        service = ParkingService(vehicle_repo, spot_repo, session_repo, cache=stats_cache)
         session = await service.register_vehicle_entry(
             license_plate=vehicle_data.license_plate,
             color=vehicle_data.color,
@@ -65,6 +64,8 @@ async def register_entry(vehicle_data):
             spot_type=vehicle_data.spot_type
         )
         await db.commit()
+        # Drop reads cached between the service's invalidation and the commit
+        stats_cache.invalidate()
         return session
 
 
@@ -73,23 +74,28 @@ async def register_exit(exit_data):
         vehicle_repo = SQLAlchemyVehicleRepository(db)
         spot_repo = SQLAlchemyParkingSpotRepository(db)
         session_repo = SQLAlchemyParkingSessionRepository(db)
-        service = ParkingService(vehicle_repo, spot_repo, session_repo)
+        service = ParkingService(vehicle_repo, spot_repo, session_repo, cache=stats_cache)
         payment = await service.register_vehicle_exit(exit_data.license_plate)
         await db.commit()
+        # Drop reads cached between the service's invalidation and the commit
+        stats_cache.invalidate()
         return payment
 
 
+async def load_dashboard():
+    # Each loader opens its own session, so the three reads can run concurrently
+    return await asyncio.gather(get_parking_status(), get_analytics(), get_active_sessions())
+
+
 # Get current status
-status = asyncio.run(get_parking_status())
-analytics = asyncio.run(get_analytics())
-active_sessions = asyncio.run(get_active_sessions())
+status, analytics, active_sessions = asyncio.run(load_dashboard())
 
 # Calculate potential revenue
-current_time = datetime.now(timezone.utc)
-potential_revenue = sum([
-    max(1.0, (current_time - s.entry_time).total_seconds() / 3600) * s.hourly_rate
+now_ts = time.time()
+potential_revenue = sum(
+    max(1.0, (now_ts - s.entry_time.timestamp()) / 3600) * s.hourly_rate
     for s in active_sessions
-]) if active_sessions else 0
+) if active_sessions else 0
 
 # Main dashboard metrics
 col1, col2, col3, col4, col5 = st.columns(5)
@@ -193,31 +199,38 @@ with tab1:
 with tab2:
     st.subheader("🚗 Currently Parked Vehicles")
 
-    sessions = asyncio.run(get_active_sessions())
+    sessions = active_sessions
 
     if sessions:
         # Calculate potential revenue for each session
-        current_time = datetime.now(timezone.utc)
-        df_sessions = pd.DataFrame([
-            {
-                "License Plate": s.vehicle.license_plate,
-                "Color": s.vehicle.color,
-                "Brand": s.vehicle.brand,
-                "Spot": s.parking_spot.spot_number,
-                "Floor": s.parking_spot.floor,
-                "Entry Time": s.entry_time.strftime("%Y-%m-%d %H:%M"),
-                "Duration (hours)": round((current_time - s.entry_time).total_seconds() / 3600, 2),
-                "Potential Revenue": f"${max(1.0, (current_time - s.entry_time).total_seconds() / 3600) * s.hourly_rate:.2f}"
-            }
-            for s in sessions
-        ])
-
-        # Calculate total potential revenue
-        total_potential = sum([
-            max(1.0, (current_time - s.entry_time).total_seconds() /
-                3600) * s.hourly_rate
-            for s in sessions
-        ])
+        now_ts = time.time()
+        columns = {
+            "License Plate": [],
+            "Color": [],
+            "Brand": [],
+            "Spot": [],
+            "Floor": [],
+            "Entry Time": [],
+            "Duration (hours)": [],
+            "Potential Revenue": [],
+        }
+        total_potential = 0.0
+        for s in sessions:
+            hours = (now_ts - s.entry_time.timestamp()) / 3600
+            revenue = max(1.0, hours) * s.hourly_rate
+            total_potential += revenue
+            columns["License Plate"].append(s.vehicle.license_plate)
+            columns["Color"].append(s.vehicle.color)
+            columns["Brand"].append(s.vehicle.brand)
+            columns["Spot"].append(s.parking_spot.spot_number)
+            columns["Floor"].append(s.parking_spot.floor)
+            columns["Entry Time"].append(s.entry_time)
+            columns["Duration (hours)"].append(round(hours, 2))
+            columns["Potential Revenue"].append(f"${revenue:.2f}")
+
+        df_sessions = pd.DataFrame(columns)
+        df_sessions["Entry Time"] = pd.to_datetime(
+            df_sessions["Entry Time"], utc=True).dt.strftime("%Y-%m-%d %H:%M")
 
         col1, col2 = st.columns([3, 1])
         with col1:
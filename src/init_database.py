@@ -5,9 +5,11 @@ import sys
 # Add the src directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from src.infrastructure.persistence.database import init_db
+from src.infrastructure.persistence.database import init_db, refresh_daily_session_stats
 
 if __name__ == "__main__":
     print("Initializing parking database...")
     init_db()
+    print("Rebuilding parking statistics...")
+    refresh_daily_session_stats()
     print("Database initialization complete!")
\ No newline at end of file
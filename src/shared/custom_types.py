@@ -4,6 +4,8 @@ import datetime
 from sqlalchemy import DateTime, TypeDecorator
 from sqlalchemy.dialects.sqlite import DATETIME as SQLITE_DATETIME
 
+UTC = datetime.timezone.utc
+
 class UTCDateTime(TypeDecorator):
     """A custom SQLAlchemy type to store timezone-aware datetime objects in UTC.
 
@@ -21,14 +23,17 @@ class UTCDateTime(TypeDecorator):
     def process_bind_param(self, value: datetime.datetime | None, dialect) -> datetime.datetime | None:
         if value is None:
             return None
-        if value.tzinfo is None:
-            # Assume naive datetime is in local timezone and convert to UTC
-            value = value.astimezone(datetime.timezone.utc)
-        return value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        if value.tzinfo is UTC:
+            return value.replace(tzinfo=None)
+        # Naive datetimes are assumed local; astimezone converts both cases in one step
+        return value.astimezone(UTC).replace(tzinfo=None)
 
     def process_result_value(self, value: datetime.datetime | None, dialect) -> datetime.datetime | None:
         if value is None:
             return None
-        if value.tzinfo is None:
-            return value.replace(tzinfo=datetime.timezone.utc)
-        return value.astimezone(datetime.timezone.utc)
+        tz = value.tzinfo
+        if tz is None:
+            return value.replace(tzinfo=UTC)
+        if tz is UTC:
+            return value
+        return value.astimezone(UTC)
@@ -0,0 +1,65 @@
+"""Small in-process TTL cache for read-mostly parking statistics."""
+import copy
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class TTLCache:
+    """Cache-aside store whose entries expire on the monotonic clock.
+
+    Values are handed out as deep copies, so a caller that mutates a cached
+    dict or list does not change what the next caller sees.
+    """
+
+    def __init__(self):
+        # key -> (expires_at, value)
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        # Bumped by invalidate(); a value computed across a bump is not stored
+        self._generation = 0
+
+    def _get(self, key: str, now: float) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry and entry[0] > now:
+            return True, copy.deepcopy(entry[1])
+        return False, None
+
+    def _store(self, key: str, expires_at: float, generation: int, value: Any) -> Any:
+        # A write that committed while `compute` ran may not be reflected in `value`
+        if generation == self._generation:
+            self._entries[key] = (expires_at, value)
+        return copy.deepcopy(value)
+
+    def cached(self, key: str, ttl: float, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for `key`, calling `compute` once it has expired."""
+        now = time.monotonic()
+        hit, value = self._get(key, now)
+        if hit:
+            return value
+        generation = self._generation
+        return self._store(key, now + ttl, generation, compute())
+
+    async def cached_async(self, key: str, ttl: float, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Async variant of `cached` for repository and service calls."""
+        now = time.monotonic()
+        hit, value = self._get(key, now)
+        if hit:
+            return value
+        generation = self._generation
+        return self._store(key, now + ttl, generation, await compute())
+
+    def invalidate(self) -> None:
+        """Drop every cached value, e.g. after a vehicle entry or exit."""
+        self._generation += 1
+        self._entries.clear()
+
+
+# Process-wide cache shared by the dashboard and the AI assistant.
+stats_cache = TTLCache()
+
+
+def cached(key: str, ttl: float, compute: Callable[[], Any]) -> Any:
+    return stats_cache.cached(key, ttl, compute)
+
+
+def invalidate() -> None:
+    stats_cache.invalidate()
@@ -1,20 +1,33 @@
 import sys
+from typing import Optional
 from loguru import logger as loguru_logger
 
-from src.config.settings_env import settings
+from src.config.settings_env import Settings, settings as default_settings
 
 
 
 
-def initialize_logger():
-    """Initialize the logger based on DEV_MODE setting."""
+_initialized = False
+
+
+def initialize_logger(settings: Optional[Settings] = None):
+    """Initialize the logger based on DEV_MODE setting.
+
+    Later calls are no-ops unless `settings` is passed, which reconfigures the sinks.
+    """
+    global _initialized
+    if _initialized and settings is None:
+        return loguru_logger
+    settings = settings or default_settings
     loguru_logger.remove()
     
+    # enqueue=True hands records to a writer thread so stderr writes never block the event loop
     if settings.DEV_MODE:
-        loguru_logger.add(sys.stderr, level="TRACE")
+        loguru_logger.add(sys.stderr, level="TRACE", enqueue=True)
     else:
-        loguru_logger.add(sys.stderr, level="INFO")
+        loguru_logger.add(sys.stderr, level="INFO", enqueue=True)
     
+    _initialized = True
     return loguru_logger
 
 
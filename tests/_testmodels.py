@@ -0,0 +1,66 @@
+"""Test-only declarative models shared by the sync ORM test modules."""
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey
+from sqlalchemy.orm import relationship, declarative_base
+
+from src.shared.custom_types import UTCDateTime
+
+# One test-specific Base, so all the test models share a single MetaData and class registry
+TestBase = declarative_base()
+# Inherited by every model below, so pytest does not try to collect the Test* classes
+TestBase.__test__ = False
+
+class TestVehicle(TestBase):
+    __tablename__ = "vehicles"
+    id = Column(Integer, primary_key=True, index=True)
+    license_plate = Column(String, index=True) # No unique=True
+    color = Column(String, nullable=False)
+    brand = Column(String, nullable=False)
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
+
+    parking_sessions = relationship("TestParkingSession", back_populates="vehicle")
+
+class TestParkingSpot(TestBase):
+    __tablename__ = "parking_spots"
+    id = Column(Integer, primary_key=True, index=True)
+    spot_number = Column(String, unique=True, index=True)
+    is_occupied = Column(Boolean, default=False)
+    floor = Column(Integer, default=1)
+    spot_type = Column(String, default="regular")
+
+    parking_sessions = relationship("TestParkingSession", back_populates="parking_spot")
+
+class TestParkingSession(TestBase):
+    __tablename__ = "parking_sessions"
+    id = Column(Integer, primary_key=True, index=True)
+    vehicle_id = Column(Integer, ForeignKey("vehicles.id"))
+    parking_spot_id = Column(Integer, ForeignKey("parking_spots.id"))
+    entry_time = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    exit_time = Column(UTCDateTime, nullable=True)
+    amount_paid = Column(Float, nullable=True)
+    payment_status = Column(String, default="pending")
+    hourly_rate = Column(Float, default=5.0)
+
+    vehicle = relationship("TestVehicle", back_populates="parking_sessions")
+    parking_spot = relationship("TestParkingSpot", back_populates="parking_sessions")
+
+    @property
+    def duration_hours(self):
+        if self.exit_time:
+            duration = self.exit_time - self.entry_time
+            return duration.total_seconds() / 3600
+        return None
+
+    @property
+    def calculate_amount(self):
+        if self.duration_hours:
+            return round(self.duration_hours * self.hourly_rate, 2)
+        return None
+
+
+class TestModel(TestBase):
+    """Single UTCDateTime column, for the custom type round-trip tests."""
+    __tablename__ = "test_table"
+    id = Column(Integer, primary_key=True)
+    utc_datetime_col = Column(UTCDateTime)
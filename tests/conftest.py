@@ -1,14 +1,19 @@
+import asyncio
 import pytest
+import pytest_asyncio
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy.pool import NullPool
-import tempfile
-import os
-from freezegun import freeze_time
+import sqlite3
+import uuid
 from datetime import datetime, timedelta, timezone
 
 from src.infrastructure.persistence.models.models import Base
+from src.infrastructure.persistence.database import async_engine_options
 from src.infrastructure.persistence.sqlalchemy_repositories.sqlalchemy_repositories import SQLAlchemyVehicleRepository, SQLAlchemyParkingSpotRepository, SQLAlchemyParkingSessionRepository
 from src.application.services.parking_service import ParkingService
+from src.domain.common import SpotType
 from src.application.services.analytics_service import AnalyticsService
 from src.config.settings_env import Settings
 
@@ -16,25 +21,127 @@ from src.config.settings_env import Settings
 # Event loop fixture removed - pytest-asyncio provides it automatically
 
 
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run the async tests on uvloop, a dev dependency everywhere except Windows."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
+def pytest_collection_modifyitems(items):
+    """Run every async test on the session-scoped event loop used by the async fixtures."""
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if pytest_asyncio.is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+
+def _test_spot_rows():
+    """Rows for the 15 test parking spots (3 floors x 5) provided by init_parking_spots."""
+    rows = []
+    for floor in range(1, 4):
+        for spot_num in range(1, 6):  # Only 5 spots per floor for testing
+            rows.append({
+                "spot_number": f"{floor}-{spot_num:02d}",
+                "floor": floor,
+                "spot_type": "disabled" if spot_num == 1 else "vip" if spot_num == 2 else "regular",
+                "is_occupied": False,
+            })
+    return rows
+
+
+@pytest.fixture(scope="session")
+def template_dbs():
+    """Build in-memory template databases once per test session: schema only, and schema plus spots."""
+    from src.infrastructure.persistence.models.models import ParkingSpot
+
+    engines = {}
+    for name in ("empty", "spots"):
+        # Sync engine, so the session-scoped fixture is not tied to any test's event loop;
+        # StaticPool keeps the single in-memory connection (and its data) alive
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        if name == "spots":
+            with engine.begin() as conn:
+                conn.execute(insert(ParkingSpot), _test_spot_rows())
+        engines[name] = engine
+
+    yield {name: engine.raw_connection().driver_connection for name, engine in engines.items()}
+
+    for engine in engines.values():
+        engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def sync_engine():
+    """One in-memory sync engine per test session (per xdist worker) for the sync ORM tests."""
+    # StaticPool keeps the single in-memory connection (and its data) alive
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+
+    # pysqlite defers BEGIN and breaks SAVEPOINTs; let SQLAlchemy emit BEGIN itself
+    @event.listens_for(engine, "connect")
+    def _no_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def sync_session(sync_engine):
+    """A sync Session inside a transaction that is rolled back after the test."""
+    connection = sync_engine.connect()
+    transaction = connection.begin()
+    # Session commits only release SAVEPOINTs; rolling back the outer transaction resets the tables
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="module")
+def test_model_tables(sync_engine):
+    """Create the tests._testmodels tables on sync_engine for one test module."""
+    from tests._testmodels import TestBase
+
+    TestBase.metadata.create_all(sync_engine)
+    yield
+    TestBase.metadata.drop_all(sync_engine)
+
+
+@pytest.fixture
+def db_template(template_dbs, request):
+    """Pick the template copied by test_db; tests that use init_parking_spots start with the spots in place."""
+    return template_dbs["spots" if "init_parking_spots" in request.fixturenames else "empty"]
+
+
 @pytest.fixture(scope="function")
-async def test_db():
-    """Create a test database for each test function."""
-    # Create a temporary file for the test database
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_file:
-        test_db_path = tmp_file.name
+async def test_db(db_template):
+    """Create an in-memory test database for each test function by copying a template."""
+    # A named shared-cache memory database lives as long as one connection to it is open;
+    # `keeper` holds it for the test so every engine connection sees the same data
+    name = f"file:test_{uuid.uuid4().hex}?mode=memory&cache=shared"
+    keeper = sqlite3.connect(name, uri=True)
+    db_template.backup(keeper)
     
-    # Create async engine with NullPool to avoid connection issues
-    test_db_url = f"sqlite+aiosqlite:///{test_db_path}"
+    # Same pool settings as the application engine
+    test_db_url = f"sqlite+aiosqlite:///{name}&uri=true"
     engine = create_async_engine(
         test_db_url,
-        poolclass=NullPool,
-        echo=False
+        echo=False,
+        **async_engine_options(test_db_url)
     )
     
-    # Create all tables
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    
     # Create session factory
     async_session_maker = async_sessionmaker(
         engine,
@@ -45,9 +152,9 @@ async def test_db():
     # Yield the session factory
     yield async_session_maker
     
-    # Cleanup
+    # Cleanup: the database disappears with its last connection
     await engine.dispose()
-    os.unlink(test_db_path)
+    keeper.close()
 
 
 @pytest.fixture
@@ -58,7 +165,7 @@ async def db_session(test_db):
         await session.rollback()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_settings():
     """Provide test settings."""
     return Settings(
@@ -72,26 +179,11 @@ def test_settings():
 
 @pytest.fixture
 async def init_parking_spots(db_session: AsyncSession):
-    """Initialize parking spots for testing."""
+    """Return the test parking spots, already present in the database copied by test_db."""
     from src.infrastructure.persistence.models.models import ParkingSpot
     
-    # Create test parking spots
-    spots = []
-    for floor in range(1, 4):
-        for spot_num in range(1, 6):  # Only 5 spots per floor for testing
-            spot_number = f"{floor}-{spot_num:02d}"
-            spot_type = "disabled" if spot_num == 1 else "vip" if spot_num == 2 else "regular"
-            spot = ParkingSpot(
-                spot_number=spot_number,
-                floor=floor,
-                spot_type=spot_type,
-                is_occupied=False
-            )
-            spots.append(spot)
-            db_session.add(spot)
-    
-    await db_session.commit()
-    return spots
+    result = await db_session.scalars(select(ParkingSpot).order_by(ParkingSpot.id))
+    return result.all()
 
 
 @pytest.fixture
@@ -134,21 +226,28 @@ async def sample_parking_session(db_session: AsyncSession, sample_vehicle, init_
 @pytest.fixture
 async def parked_vehicle(parking_service, init_parking_spots):
     """Create a vehicle that's already parked."""
-    with freeze_time(datetime.now(timezone.utc) - timedelta(hours=2)):
-        session_response = await parking_service.register_vehicle_entry(
-            license_plate="PARKED123",
-            color="Silver",
-            brand="Mercedes",
-            spot_type=SpotType.REGULAR
-        )
+    session_response = await parking_service.register_vehicle_entry(
+        license_plate="PARKED123",
+        color="Silver",
+        brand="Mercedes",
+        spot_type=SpotType.REGULAR,
+        entry_time=datetime.now(timezone.utc) - timedelta(hours=2)
+    )
     return session_response
 
 @pytest.fixture
-async def parking_service(db_session):
+def repos(db_session):
+    """Create the vehicle, parking spot and parking session repositories on the test database session."""
+    return (
+        SQLAlchemyVehicleRepository(db_session),
+        SQLAlchemyParkingSpotRepository(db_session),
+        SQLAlchemyParkingSessionRepository(db_session),
+    )
+
+@pytest.fixture
+def parking_service(repos):
     """Create a ParkingService instance with test database session."""
-    vehicle_repo = SQLAlchemyVehicleRepository(db_session)
-    parking_spot_repo = SQLAlchemyParkingSpotRepository(db_session)
-    parking_session_repo = SQLAlchemyParkingSessionRepository(db_session)
+    vehicle_repo, parking_spot_repo, parking_session_repo = repos
     return ParkingService(
         vehicle_repo=vehicle_repo,
         parking_spot_repo=parking_spot_repo,
@@ -156,11 +255,9 @@ async def parking_service(db_session):
     )
 
 @pytest.fixture
-async def analytics_service(db_session):
+def analytics_service(repos):
     """Create an AnalyticsService instance with test database session."""
-    vehicle_repo = SQLAlchemyVehicleRepository(db_session)
-    parking_spot_repo = SQLAlchemyParkingSpotRepository(db_session)
-    parking_session_repo = SQLAlchemyParkingSessionRepository(db_session)
+    vehicle_repo, parking_spot_repo, parking_session_repo = repos
     return AnalyticsService(
         vehicle_repo=vehicle_repo,
         parking_spot_repo=parking_spot_repo,
@@ -168,13 +265,6 @@ async def analytics_service(db_session):
     )
 
 @pytest.fixture
-async def empty_db_for_analytics(db_session):
+def empty_db_for_analytics(analytics_service):
     """Provides an analytics service with an empty database."""
-    vehicle_repo = SQLAlchemyVehicleRepository(db_session)
-    parking_spot_repo = SQLAlchemyParkingSpotRepository(db_session)
-    parking_session_repo = SQLAlchemyParkingSessionRepository(db_session)
-    return AnalyticsService(
-        vehicle_repo=vehicle_repo,
-        parking_spot_repo=parking_spot_repo,
-        parking_session_repo=parking_session_repo
-    )
\ No newline at end of file
+    return analytics_service
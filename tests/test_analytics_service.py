@@ -1,19 +1,45 @@
 import pytest
-from datetime import datetime, timedelta, timezone
-from freezegun import freeze_time
+from datetime import datetime, time, timedelta, timezone
 
 from src.application.services.analytics_service import AnalyticsService
 from src.domain.common import SpotType, PaymentStatus
-from src.infrastructure.persistence.models.models import ParkingSession as ORMParkingSession
-from sqlalchemy import delete
+from src.infrastructure.persistence.daily_stats import utc_day, sessions_per_day, payments_per_day, merge_daily_stats
+from src.infrastructure.persistence.database import refresh_daily_session_stats
+from src.infrastructure.persistence.models.models import ParkingSession as ORMParkingSession, ParkingSpot as ORMParkingSpot, Vehicle as ORMVehicle, ParkingStats, DailySessionStats
+from src.infrastructure.persistence.sqlalchemy_repositories.sqlalchemy_repositories import SQLAlchemyParkingSessionRepository
+from src.shared.ttl_cache import TTLCache
+from sqlalchemy import case, create_engine, insert, select, update
+from sqlalchemy.pool import StaticPool
 
 
 
 
 
-@pytest.fixture
-async def setup_test_data(db_session, parking_service, init_parking_spots):
-    """Set up test data with various parking sessions."""
+class FakeClock:
+    """Manually advanced clock to inject into ParkingService."""
+
+    def __init__(self, start: datetime):
+        self.current = start
+
+    def now(self) -> datetime:
+        return self.current
+
+    def advance(self, **delta) -> None:
+        self.current += timedelta(**delta)
+
+
+@pytest.fixture(scope="module")
+def analytics_template(template_dbs):
+    """Seed a copy of the spots template once per module with various parking sessions.
+
+    Rows are bulk-inserted rather than registered through ParkingService:
+    these tests exercise the analytics queries, not the entry/exit flow.
+    The roll-up tables the readers use are then rebuilt from those rows.
+    """
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    template = engine.raw_connection().driver_connection
+    template_dbs["spots"].backup(template)
+
     # Create vehicles with different colors and brands
     vehicles_data = [
         ("RED001", "Red", "Toyota"),
@@ -22,26 +48,60 @@ async def setup_test_data(db_session, parking_service, init_parking_spots):
         ("WHITE001", "White", "BMW"),
         ("BLACK001", "Black", "Mercedes"),
     ]
-    
-    sessions = []
-    base_time = datetime.now(timezone.utc)
-    
-    for i, (plate, color, brand) in enumerate(vehicles_data):
-        # Register entry
-        session = await parking_service.register_vehicle_entry(
-            license_plate=plate,
-            color=color,
-            brand=brand,
-            spot_type=SpotType.REGULAR
+    with engine.begin() as conn:
+        vehicle_ids = conn.scalars(
+            insert(ORMVehicle).returning(ORMVehicle.id, sort_by_parameter_order=True),
+            [
+                {"license_plate": plate, "color": color, "color_lc": color.lower(), "brand": brand}
+                for plate, color, brand in vehicles_data
+            ]
+        ).all()
+
+        # Park them on regular spots in allocation order; the first 3 have exited and paid
+        regular_spots = conn.scalars(
+            select(ORMParkingSpot.id).where(ORMParkingSpot.spot_type == SpotType.REGULAR).order_by(ORMParkingSpot.id)
+        ).all()
+        base_time = datetime.now(timezone.utc)
+        session_rows = []
+        for i, (vehicle_id, spot_id) in enumerate(zip(vehicle_ids, regular_spots)):
+            row = {
+                "vehicle_id": vehicle_id,
+                "parking_spot_id": spot_id,
+                "entry_time": base_time - timedelta(hours=i + 1),
+                "hourly_rate": 5.0,
+            }
+            if i < 3:
+                row.update(exit_time=base_time, amount_paid=(i + 1) * 5.0, payment_status=PaymentStatus.PAID)
+            else:
+                row.update(exit_time=None, amount_paid=None, payment_status=PaymentStatus.PENDING)
+            session_rows.append(row)
+        conn.execute(insert(ORMParkingSession), session_rows)
+
+        conn.execute(
+            update(ORMParkingSpot)
+            .where(ORMParkingSpot.id.in_([row["parking_spot_id"] for row in session_rows[3:]]))
+            .values(is_occupied=True)
         )
-        sessions.append(session)
-    
-    # Exit some vehicles with payments
-    for i, session in enumerate(sessions[:3]):  # Exit first 3 vehicles
-        vehicle = await parking_service.vehicle_repo.get_by_id(session.vehicle_id)
-        await parking_service.register_vehicle_exit(vehicle.license_plate)
-    
-    return sessions
+    refresh_daily_session_stats(engine)
+
+    yield template
+
+    engine.dispose()
+
+
+@pytest.fixture
+def db_template(db_template, request):
+    """Start tests that use setup_test_data from the seeded analytics template."""
+    if "setup_test_data" in request.fixturenames:
+        return request.getfixturevalue("analytics_template")
+    return db_template
+
+
+@pytest.fixture
+def setup_test_data(init_parking_spots):
+    """Start the test from the parking sessions seeded by analytics_template."""
+    # db_template above swaps in the seeded template and test_db copies it for each
+    # test, so writes made by one test never leak into the next.
 
 
 class TestAnalyticsServiceRevenue:
@@ -58,17 +118,24 @@ class TestAnalyticsServiceRevenue:
         assert revenue_1h >= 0
         assert revenue_1h <= revenue_24h
     
+    async def test_get_revenue_by_day_from_seeded_roll_up(self, analytics_service, db_session, setup_test_data):
+        """Test that per-day revenue reads the daily_session_stats row built from the seeded exits."""
+        exit_time = (await db_session.scalars(select(ORMParkingSession.exit_time).where(ORMParkingSession.exit_time.is_not(None)))).first()
+        stats = (await db_session.execute(select(DailySessionStats).where(DailySessionStats.date == utc_day(exit_time)))).scalar_one()
+        assert stats.revenue == 30.0  # 5 + 10 + 15
+        assert stats.vehicles == 3
+
+        revenue_by_day = await analytics_service.get_revenue_by_day(7)
+        assert revenue_by_day == [{"date": utc_day(exit_time).isoformat(), "revenue": 30.0}]
+
     async def test_get_revenue_no_payments(self, analytics_service, init_parking_spots):
         """Test revenue when no payments have been made."""
         revenue = await analytics_service.get_revenue_last_hours(24)
         assert revenue == 0.0
 
-    async def test_get_revenue_for_period_with_no_payments(self, analytics_service: AnalyticsService, empty_db_for_analytics, db_session):
+    async def test_get_revenue_for_period_with_no_payments(self, analytics_service: AnalyticsService, empty_db_for_analytics):
         """Test revenue for a period with no payments."""
-        # Ensure no existing parking sessions interfere
-        await db_session.execute(delete(ORMParkingSession))
-        await db_session.commit()
-
+        # test_db clones a fresh database per test, so no sessions exist here
         revenue = await empty_db_for_analytics.get_revenue_last_hours(0)
         assert revenue == 0.0
     
@@ -82,18 +149,18 @@ class TestAnalyticsServiceRevenue:
             entry_time = base_date - timedelta(days=i + 1, hours=2)
             exit_time = base_date - timedelta(days=i + 1, hours=1)
             
-            # Manually set exit time and amount paid for accurate revenue calculation
+            # Exits go through the repository so the daily roll-up follows them
             session = await parking_service.register_vehicle_entry(
                 license_plate=f"DAY{i}",
                 color="Blue",
                 brand="Toyota",
-                spot_type=SpotType.REGULAR
+                spot_type=SpotType.REGULAR,
+                entry_time=entry_time
             )
-            session_obj = await parking_service.parking_session_repo.get_by_id(session.id)
-            session_obj.exit_time = exit_time
-            session_obj.amount_paid = 5.0 * ((exit_time - entry_time).total_seconds() / 3600) # Assuming 5.0 hourly rate
-            session_obj.payment_status = PaymentStatus.PAID
-            await parking_service.parking_session_repo.update(session_obj)
+            session.exit_time = exit_time
+            session.amount_paid = 5.0 * ((exit_time - entry_time).total_seconds() / 3600) # Assuming 5.0 hourly rate
+            session.payment_status = PaymentStatus.PAID
+            await parking_service.parking_session_repo.update(session)
         
         # Get revenue by day
         revenue_data = await analytics_service.get_revenue_by_day(7)
@@ -103,6 +170,50 @@ class TestAnalyticsServiceRevenue:
         assert all("date" in item for item in revenue_data)
 
 
+    async def test_get_revenue_by_day_follows_session_updates(self, analytics_service, parking_service, init_parking_spots):
+        """Test that the daily roll-up moves revenue when a session's exit day changes."""
+        now = datetime.now(timezone.utc)
+        session = await parking_service.register_vehicle_entry(
+            license_plate="MOVE1", color="Blue", brand="Toyota", spot_type=SpotType.REGULAR
+        )
+        session.exit_time = now - timedelta(days=3)
+        session.amount_paid = 7.5
+        session.payment_status = PaymentStatus.PAID
+        await parking_service.parking_session_repo.update(session)
+
+        first_day = (now - timedelta(days=3)).date().isoformat()
+        assert await analytics_service.get_revenue_by_day(7) == [{"date": first_day, "revenue": 7.5}]
+
+        session.exit_time = now - timedelta(days=2)
+        await parking_service.parking_session_repo.update(session)
+
+        second_day = (now - timedelta(days=2)).date().isoformat()
+        assert await analytics_service.get_revenue_by_day(7) == [{"date": second_day, "revenue": 7.5}]
+
+    async def test_daily_roll_up_increments_match_full_rebuild(self, parking_service, db_session, init_parking_spots):
+        """Test that the per-write upserts leave the same rows as a full rebuild, counting a repeat payer once."""
+        exit_time = datetime.now(timezone.utc) - timedelta(hours=1)
+        for plate, amount in (("REPEAT1", 4.0), ("REPEAT1", 6.0), ("OTHER1", 5.0)):
+            session = await parking_service.register_vehicle_entry(
+                license_plate=plate, color="Blue", brand="Toyota", spot_type=SpotType.REGULAR
+            )
+            session.exit_time = exit_time
+            session.amount_paid = amount
+            session.payment_status = PaymentStatus.PAID
+            await parking_service.parking_session_repo.update(session)
+
+        stats = (await db_session.execute(select(DailySessionStats).where(DailySessionStats.date == utc_day(exit_time)))).scalar_one()
+        assert (stats.revenue, stats.vehicles) == (15.0, 2)
+
+        rebuilt = merge_daily_stats(
+            (await db_session.execute(sessions_per_day())).all(),
+            (await db_session.execute(payments_per_day())).all(),
+        )
+        rows = (await db_session.execute(select(DailySessionStats))).scalars().all()
+        incremental = [{"date": r.date, "revenue": r.revenue, "vehicles": r.vehicles, "sessions": r.sessions} for r in rows]
+        assert sorted(incremental, key=lambda r: r["date"]) == sorted(rebuilt, key=lambda r: r["date"])
+
+
 class TestAnalyticsServiceVehicleCounts:
     """Test vehicle counting analytics."""
     
@@ -124,11 +235,46 @@ class TestAnalyticsServiceVehicleCounts:
         red_count_lower = await analytics_service.count_vehicles_by_color("red", active_only=True)
         assert red_count_lower == red_count
     
-    async def test_get_current_vehicle_count(self, analytics_service, setup_test_data):
-        """Test getting current total vehicle count."""
+    async def test_get_current_vehicle_count(self, analytics_service, db_session, setup_test_data):
+        """Test getting current total vehicle count from the seeded parking_stats counter."""
+        stats = (await db_session.execute(select(ParkingStats))).scalar_one()
+        assert stats.current_occupancy == 2
+        assert stats.lifetime_entries == 5
+
         count = await analytics_service.get_current_vehicle_count()
         assert count == 2  # Only BLACK001 and WHITE001 are still parked
-    
+
+    async def test_get_daily_average_vehicles_from_seeded_roll_up(self, analytics_service, db_session, setup_test_data):
+        """Test that the daily average reads the daily_session_stats rows built from the seeded sessions."""
+        entry_times = (await db_session.scalars(select(ORMParkingSession.entry_time))).all()
+        sessions_by_day = {}
+        for entry_time in entry_times:
+            sessions_by_day[utc_day(entry_time)] = sessions_by_day.get(utc_day(entry_time), 0) + 1
+
+        # Just after midnight the seeded exits fall on the next day, whose row has no sessions
+        rows = (await db_session.execute(
+            select(DailySessionStats.date, DailySessionStats.sessions).where(DailySessionStats.sessions > 0)
+        )).all()
+        assert dict(rows) == sessions_by_day
+
+        avg = await analytics_service.get_daily_average_vehicles(30)
+        assert avg == 5 / len(sessions_by_day)
+
+    async def test_current_vehicle_count_reads_running_counter(self, db_session, parking_service, init_parking_spots):
+        """Test that entries and exits keep the parking_stats counter in step with a recount."""
+        for plate in ("CNT1", "CNT2", "CNT3"):
+            await parking_service.register_vehicle_entry(
+                license_plate=plate, color="Blue", brand="Ford", spot_type=SpotType.REGULAR
+            )
+        await parking_service.register_vehicle_exit("CNT1")
+
+        stats = (await db_session.execute(select(ParkingStats))).scalar_one()
+        assert stats.current_occupancy == 2
+        assert stats.lifetime_entries == 3
+
+        repo = SQLAlchemyParkingSessionRepository(db_session)
+        assert await repo.get_current_vehicle_count() == 2
+
     async def test_get_daily_average_vehicles(self, analytics_service, parking_service, init_parking_spots):
         """Test calculating daily average vehicle count."""
         # Create sessions across multiple days
@@ -140,7 +286,8 @@ class TestAnalyticsServiceVehicleCounts:
                 license_plate=f"DAY1_{i}",
                 color="Blue",
                 brand="Toyota",
-                spot_type=SpotType.REGULAR
+                spot_type=SpotType.REGULAR,
+                entry_time=base_date - timedelta(days=2)
             )
         
         # Day 2: 2 vehicles
@@ -149,67 +296,120 @@ class TestAnalyticsServiceVehicleCounts:
                 license_plate=f"DAY2_{i}",
                 color="Red",
                 brand="Honda",
-                spot_type=SpotType.REGULAR
+                spot_type=SpotType.REGULAR,
+                entry_time=base_date - timedelta(days=1)
             )
         
         # Calculate average
         avg = await analytics_service.get_daily_average_vehicles(30)
-        assert avg > 0
+        assert avg == 2.5  # (3 + 2) / 2
+
+    async def test_get_daily_average_vehicles_counts_whole_cutoff_day(self, analytics_service, parking_service, init_parking_spots):
+        """Test that the window covers the whole UTC day of the cutoff, not just the hours after it."""
+        now = datetime.now(timezone.utc)
+        cutoff_day_start = datetime.combine((now - timedelta(days=2)).date(), time.min, tzinfo=timezone.utc)
+
+        # Two entries at the very start of the cutoff day, before the cutoff instant itself
+        for i in range(2):
+            await parking_service.register_vehicle_entry(
+                license_plate=f"EDGE_{i}",
+                color="Blue",
+                brand="Toyota",
+                spot_type=SpotType.REGULAR,
+                entry_time=cutoff_day_start
+            )
+        await parking_service.register_vehicle_entry(
+            license_plate="TODAY_0", color="Red", brand="Honda", spot_type=SpotType.REGULAR, entry_time=now
+        )
+
+        avg = await analytics_service.get_daily_average_vehicles(2)
+        assert avg == 1.5  # (2 + 1) / 2
 
 
 class TestAnalyticsServiceDurations:
     """Test parking duration analytics."""
     
-    async def test_get_average_duration_by_color(self, analytics_service, parking_service, init_parking_spots):
+    async def test_get_average_duration_by_color(self, analytics_service, parking_service, db_session, init_parking_spots):
         """Test calculating average parking duration by vehicle color."""
-        base_time = datetime.now(timezone.utc)
-        
-        # Create and exit red vehicles with known durations
+        # Create red vehicles, then set every exit time in one statement
+        exit_times = {}
         for i, hours in enumerate([2, 3, 4]):  # Average should be 3 hours
-            # Entry
             session = await parking_service.register_vehicle_entry(
                 license_plate=f"REDTEST{i}",
                 color="Red",
                 brand="Toyota",
                 spot_type=SpotType.REGULAR
             )
-            
-            # Manually set exit time for accurate duration calculation
-            session_obj = await parking_service.parking_session_repo.get_by_id(session.id)
-            session_obj.exit_time = session_obj.entry_time + timedelta(hours=hours)
-            await parking_service.parking_session_repo.update(session_obj)
-            print(f"Entry Time: {session_obj.entry_time}, Exit Time: {session_obj.exit_time}, Hours: {hours}")
-            
-            
-            # No need to call register_vehicle_exit as we manually set exit_time and committed
-            # await parking_service.register_vehicle_exit(exit_data)
+            exit_times[session.id] = session.entry_time + timedelta(hours=hours)
+        
+        await db_session.execute(
+            update(ORMParkingSession)
+            .where(ORMParkingSession.id.in_(exit_times))
+            .values(exit_time=case(exit_times, value=ORMParkingSession.id))
+        )
         
         avg_duration = await analytics_service.get_average_duration_by_color("Red")
-        assert avg_duration == pytest.approx(3.0, 0.1)
+        assert avg_duration == 3.0
     
     async def test_get_average_daily_spending(self, analytics_service, parking_service, init_parking_spots):
         """Test calculating average spending per vehicle per day."""
-        base_time = datetime.now(timezone.utc)
-        
         # Create sessions with known amounts
-        # Vehicle 1: 2 hours = $10
-        session1 = await parking_service.register_vehicle_entry(license_plate="SPEND1", color="Blue", brand="Ford", spot_type=SpotType.REGULAR)
-        session_obj1 = await parking_service.parking_session_repo.get_by_id(session1.id)
-        session_obj1.exit_time = session_obj1.entry_time + timedelta(hours=2)
-        session_obj1.amount_paid = 10.0
-        session_obj1.payment_status = PaymentStatus.PAID
-        await parking_service.parking_session_repo.update(session_obj1)
-
-        # Vehicle 2: 4 hours = $20
-        session2 = await parking_service.register_vehicle_entry(license_plate="SPEND2", color="Red", brand="Honda", spot_type=SpotType.REGULAR)
-        session_obj2 = await parking_service.parking_session_repo.get_by_id(session2.id)
-        session_obj2.exit_time = session_obj2.entry_time + timedelta(hours=4)
-        session_obj2.amount_paid = 20.0
-        session_obj2.payment_status = PaymentStatus.PAID
-        await parking_service.parking_session_repo.update(session_obj2)
+        for plate, color, brand, hours, amount in [
+            ("SPEND1", "Blue", "Ford", 2, 10.0),  # 2 hours = $10
+            ("SPEND2", "Red", "Honda", 4, 20.0),  # 4 hours = $20
+        ]:
+            session = await parking_service.register_vehicle_entry(license_plate=plate, color=color, brand=brand, spot_type=SpotType.REGULAR)
+            session.exit_time = session.entry_time + timedelta(hours=hours)
+            session.amount_paid = amount
+            session.payment_status = PaymentStatus.PAID
+            await parking_service.parking_session_repo.update(session)
         
         avg_spending = await analytics_service.get_average_daily_spending(30)
-        assert avg_spending == pytest.approx(15.0, 0.1)  # (10 + 20) / 2
+        assert avg_spending == 15.0  # (10 + 20) / 2
+
+    async def test_get_average_daily_spending_skips_zero_revenue_days(self, analytics_service, parking_service, init_parking_spots):
+        """Test that a day whose paid exits brought no revenue does not dilute the average."""
+        now = datetime.now(timezone.utc)
+        for plate, exit_time, amount in [
+            ("PAID1", now, 20.0),
+            ("FREE1", now - timedelta(days=3), 0.0),  # e.g. a waived fee
+        ]:
+            session = await parking_service.register_vehicle_entry(
+                license_plate=plate, color="Blue", brand="Ford", spot_type=SpotType.REGULAR,
+                entry_time=exit_time - timedelta(hours=1)
+            )
+            session.exit_time = exit_time
+            session.amount_paid = amount
+            session.payment_status = PaymentStatus.PAID
+            await parking_service.parking_session_repo.update(session)
+
+        avg_spending = await analytics_service.get_average_daily_spending(30)
+        assert avg_spending == 20.0  # the zero-revenue day counts neither revenue nor vehicles
+
+
+class TestAnalyticsServiceOccupancy:
+    """Test occupancy analytics."""
+
+    async def test_get_hourly_occupancy(self, analytics_service, db_session, sample_vehicle, init_parking_spots):
+        """Test the hourly occupancy histogram."""
+        day = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        db_session.add_all([
+            ORMParkingSession(
+                vehicle_id=sample_vehicle.id, parking_spot_id=1,
+                entry_time=day + timedelta(hours=3), exit_time=day + timedelta(hours=5)
+            ),
+            ORMParkingSession(
+                vehicle_id=sample_vehicle.id, parking_spot_id=2,
+                entry_time=day + timedelta(hours=10)
+            ),
+        ])
+        await db_session.flush()
+
+        hourly = await analytics_service.get_hourly_occupancy()
+
+        assert [item["hour"] for item in hourly] == list(range(24))
+        expected = [(3 <= hour <= 5) + (hour >= 10) for hour in range(24)]
+        assert [item["occupancy"] for item in hourly] == expected
 
 
 class TestAnalyticsServiceDistributions:
@@ -228,6 +428,25 @@ class TestAnalyticsServiceDistributions:
         brand_dist_all = await analytics_service.get_brand_distribution(active_only=False)
         assert len(brand_dist_all) >= len(brand_dist)
     
+    async def test_get_brand_distribution_cached_until_invalidated(self, analytics_service, parking_service, setup_test_data):
+        """Test that a cached brand distribution is reused until the cache is invalidated."""
+        cache = TTLCache()
+        cached_analytics = AnalyticsService(
+            analytics_service.vehicle_repo,
+            analytics_service.parking_session_repo,
+            analytics_service.parking_spot_repo,
+            cache=cache
+        )
+        before = await cached_analytics.get_brand_distribution(active_only=True)
+
+        await parking_service.register_vehicle_entry(
+            license_plate="CACHE1", color="Grey", brand="Kia", spot_type=SpotType.REGULAR
+        )
+        assert await cached_analytics.get_brand_distribution(active_only=True) == before
+
+        cache.invalidate()
+        assert (await cached_analytics.get_brand_distribution(active_only=True))["Kia"] == 1
+
     async def test_get_floor_distribution(self, analytics_service, setup_test_data):
         """Test getting vehicle distribution by floor."""
         floor_dist = await analytics_service.get_floor_distribution(active_only=True)
@@ -242,31 +461,65 @@ class TestAnalyticsServiceDistributions:
     
     async def test_get_parking_analytics(self, analytics_service, parking_service, init_parking_spots):
         """Test comprehensive parking analytics."""
-        today = datetime(2025, 1, 1, 10, 0, 0, tzinfo=timezone.utc)
+        # Anchored on the real UTC date: the repository's "today" window reads the wall clock
+        today = datetime.now(timezone.utc).replace(hour=10, minute=0, second=0, microsecond=0)
+        clock = FakeClock(today - timedelta(hours=5))
+        parking_service.clock = clock.now
         
-        with freeze_time(today):
-            # Register and exit a vehicle today
-            entry_time = today - timedelta(hours=5)
-            exit_time = today - timedelta(hours=2) # 3 hours duration
-
-            with freeze_time(entry_time):
-                await parking_service.register_vehicle_entry(
-                    license_plate="TODAY1", color="Green", brand="Tesla", spot_type=SpotType.REGULAR
-                )
-            
-            with freeze_time(exit_time):
-                await parking_service.register_vehicle_exit("TODAY1")
-
-            # Register another vehicle (still parked)
-            with freeze_time(today - timedelta(hours=1)):
-                await parking_service.register_vehicle_entry(
-                    license_plate="TODAY2", color="Yellow", brand="Nissan", spot_type=SpotType.REGULAR
-                )
-
-            # Now, get analytics
-            analytics = await analytics_service.get_parking_analytics()
-
-            assert analytics["current_occupancy"] == 1
-            assert analytics["today_revenue"] == pytest.approx(15.0, 0.1)
-            assert analytics["today_vehicles"] == 2
-            assert analytics["average_duration_hours"] == pytest.approx(3.0, 0.1)
\ No newline at end of file
+        # Register and exit a vehicle today (3 hours duration)
+        await parking_service.register_vehicle_entry(
+            license_plate="TODAY1", color="Green", brand="Tesla", spot_type=SpotType.REGULAR
+        )
+        clock.advance(hours=3)
+        await parking_service.register_vehicle_exit("TODAY1")
+
+        # Register another vehicle (still parked)
+        clock.advance(hours=1)
+        await parking_service.register_vehicle_entry(
+            license_plate="TODAY2", color="Yellow", brand="Nissan", spot_type=SpotType.REGULAR
+        )
+
+        # Now, get analytics
+        analytics = await analytics_service.get_parking_analytics()
+
+        assert analytics["current_occupancy"] == 1
+        assert analytics["today_revenue"] == 15.0
+        assert analytics["today_vehicles"] == 2
+        assert analytics["average_duration_hours"] == 3.0
+
+    async def test_get_parking_analytics_cached_until_invalidated(self, analytics_service, parking_service, setup_test_data):
+        """Test that the analytics summary is served from the cache until it is invalidated."""
+        cache = TTLCache()
+        cached_analytics = AnalyticsService(
+            analytics_service.vehicle_repo,
+            analytics_service.parking_session_repo,
+            analytics_service.parking_spot_repo,
+            cache=cache
+        )
+        before = await cached_analytics.get_parking_analytics()
+
+        await parking_service.register_vehicle_entry(
+            license_plate="CACHE2", color="Grey", brand="Kia", spot_type=SpotType.REGULAR
+        )
+        assert await cached_analytics.get_parking_analytics() == before
+
+        cache.invalidate()
+        assert (await cached_analytics.get_parking_analytics())["current_occupancy"] == before["current_occupancy"] + 1
+
+    async def test_get_parking_analytics_concurrent_sessions(self, analytics_service, test_db, db_session, setup_test_data):
+        """Test that out-of-band concurrent queries match the single-session path."""
+        await db_session.commit()
+
+        concurrent_repo = SQLAlchemyParkingSessionRepository(db_session, session_factory=test_db)
+        concurrent = await concurrent_repo.get_parking_analytics()
+
+        assert concurrent == await analytics_service.get_parking_analytics()
+        assert concurrent["current_occupancy"] == 2
+
+    async def test_get_parking_analytics_breakdown(self, analytics_service, setup_test_data):
+        """Test that the analytics summary carries the parked-vehicle counts by color, brand and floor."""
+        analytics = await analytics_service.get_parking_analytics()
+
+        assert analytics["color_counts"] == {"white": 1, "black": 1}
+        assert analytics["brand_counts"] == {"BMW": 1, "Mercedes": 1}
+        assert analytics["floor_counts"] == {2: 2}
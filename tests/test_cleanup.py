@@ -1,6 +1,5 @@
 import pytest
-from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, ForeignKey
-from sqlalchemy.orm import relationship, declarative_base, sessionmaker
+from sqlalchemy import insert
 from datetime import datetime, timezone
 
 import os
@@ -8,114 +7,43 @@ from unittest.mock import patch, MagicMock
 
 # Import the original cleanup_duplicates function
 from src.infrastructure.persistence.cleanup import cleanup_duplicates
-from src.shared.custom_types import UTCDateTime
-
-# Define a test-specific Base and models
-TestBase = declarative_base()
-
-class TestVehicle(TestBase):
-    __tablename__ = "vehicles"
-    id = Column(Integer, primary_key=True, index=True)
-    license_plate = Column(String, index=True) # No unique=True
-    color = Column(String, nullable=False)
-    brand = Column(String, nullable=False)
-    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
-
-    parking_sessions = relationship("TestParkingSession", back_populates="vehicle")
-
-class TestParkingSpot(TestBase):
-    __tablename__ = "parking_spots"
-    id = Column(Integer, primary_key=True, index=True)
-    spot_number = Column(String, unique=True, index=True)
-    is_occupied = Column(Boolean, default=False)
-    floor = Column(Integer, default=1)
-    spot_type = Column(String, default="regular")
-
-    parking_sessions = relationship("TestParkingSession", back_populates="parking_spot")
-
-class TestParkingSession(TestBase):
-    __tablename__ = "parking_sessions"
-    id = Column(Integer, primary_key=True, index=True)
-    vehicle_id = Column(Integer, ForeignKey("vehicles.id"))
-    parking_spot_id = Column(Integer, ForeignKey("parking_spots.id"))
-    entry_time = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
-    exit_time = Column(UTCDateTime, nullable=True)
-    amount_paid = Column(Float, nullable=True)
-    payment_status = Column(String, default="pending")
-    hourly_rate = Column(Float, default=5.0)
-
-    vehicle = relationship("TestVehicle", back_populates="parking_sessions")
-    parking_spot = relationship("TestParkingSpot", back_populates="parking_sessions")
-
-    @property
-    def duration_hours(self):
-        if self.exit_time:
-            duration = self.exit_time - self.entry_time
-            return duration.total_seconds() / 3600
-        return None
-
-    @property
-    def calculate_amount(self):
-        if self.duration_hours:
-            return round(self.duration_hours * self.hourly_rate, 2)
-        return None
+from tests._testmodels import TestVehicle, TestParkingSession, TestParkingSpot
+
 
 @pytest.fixture(scope="function")
-def db_session_cleanup():
-    engine = create_engine("sqlite:///:memory:")
-    TestBase.metadata.create_all(engine) # Use TestBase
-    SessionLocal = sessionmaker(bind=engine)
-    session = SessionLocal()
-    try:
-        yield session, engine # Yield both session and engine
-    finally:
-        session.close()
-        TestBase.metadata.drop_all(engine) # Use TestBase
+def db_session_cleanup(test_model_tables, sync_engine, sync_session):
+    return sync_session, sync_engine # Return both session and engine
 
 def test_cleanup_duplicates(db_session_cleanup):
     session, test_engine = db_session_cleanup
 
-    # Create original vehicle using TestVehicle
-    original_vehicle = TestVehicle(license_plate="ABC-123", color="red", brand="Honda")
-    session.add(original_vehicle)
-    session.commit()
-    session.refresh(original_vehicle)
-
-    # Create duplicate vehicles using TestVehicle
-    duplicate_vehicle_1 = TestVehicle(license_plate="ABC-123", color="blue", brand="Ford")
-    duplicate_vehicle_2 = TestVehicle(license_plate="ABC-123", color="green", brand="BMW")
-    session.add_all([duplicate_vehicle_1, duplicate_vehicle_2])
-    session.commit() # This commit should now succeed because TestVehicle has no unique constraint
-    session.refresh(duplicate_vehicle_1)
-    session.refresh(duplicate_vehicle_2)
+    # Create the original vehicle and its duplicates; TestVehicle has no unique constraint
+    original_vehicle_id, duplicate_vehicle_1_id, duplicate_vehicle_2_id = session.scalars(
+        insert(TestVehicle).returning(TestVehicle.id, sort_by_parameter_order=True),
+        [
+            {"license_plate": "ABC-123", "color": "red", "brand": "Honda"},
+            {"license_plate": "ABC-123", "color": "blue", "brand": "Ford"},
+            {"license_plate": "ABC-123", "color": "green", "brand": "BMW"},
+        ]
+    ).all()
 
     # Create parking spots for sessions
-    spot1_obj = TestParkingSpot(spot_number="A1", floor=1)
-    spot2_obj = TestParkingSpot(spot_number="A2", floor=1)
-    spot3_obj = TestParkingSpot(spot_number="A3", floor=1)
-    session.add_all([spot1_obj, spot2_obj, spot3_obj])
-    session.commit()
-    session.refresh(spot1_obj)
-    session.refresh(spot2_obj)
-    session.refresh(spot3_obj)
+    spot_ids = session.scalars(
+        insert(TestParkingSpot).returning(TestParkingSpot.id, sort_by_parameter_order=True),
+        [{"spot_number": spot_number, "floor": 1} for spot_number in ("A1", "A2", "A3")]
+    ).all()
 
     # Create parking sessions linked to original and duplicate vehicles
-    spot1 = TestParkingSession( # Use TestParkingSession
-        vehicle_id=original_vehicle.id,
-        parking_spot_id=spot1_obj.id,
-        entry_time=datetime.now(timezone.utc),
-    )
-    spot2 = TestParkingSession( # Use TestParkingSession
-        vehicle_id=duplicate_vehicle_1.id,
-        parking_spot_id=spot2_obj.id,
-        entry_time=datetime.now(timezone.utc),
-    )
-    spot3 = TestParkingSession( # Use TestParkingSession
-        vehicle_id=duplicate_vehicle_2.id,
-        parking_spot_id=spot3_obj.id,
-        entry_time=datetime.now(timezone.utc),
+    now = datetime.now(timezone.utc)
+    session.execute(
+        insert(TestParkingSession),
+        [
+            {"vehicle_id": vehicle_id, "parking_spot_id": spot_id, "entry_time": now}
+            for vehicle_id, spot_id in zip(
+                (original_vehicle_id, duplicate_vehicle_1_id, duplicate_vehicle_2_id), spot_ids
+            )
+        ]
     )
-    session.add_all([spot1, spot2, spot3])
     session.commit()
 
     # Before cleanup: check counts
@@ -149,8 +77,8 @@ def test_cleanup_duplicates(db_session_cleanup):
 
     # After cleanup: check counts and updated sessions
     assert session.query(TestVehicle).count() == 1 # Use TestVehicle
-    assert session.query(TestVehicle).filter_by(license_plate="ABC-123").one().id == original_vehicle.id # Use TestVehicle
+    assert session.query(TestVehicle).filter_by(license_plate="ABC-123").one().id == original_vehicle_id # Use TestVehicle
 
     # All sessions should now point to the original vehicle
     for s in session.query(TestParkingSession).all(): # Use TestParkingSession
-        assert s.vehicle_id == original_vehicle.id
\ No newline at end of file
+        assert s.vehicle_id == original_vehicle_id
\ No newline at end of file
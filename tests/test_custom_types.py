@@ -1,28 +1,12 @@
 import pytest
 from datetime import datetime, timezone, timedelta
-from sqlalchemy import create_engine, Column, Integer
-from sqlalchemy.orm import sessionmaker, declarative_base
 from src.shared.custom_types import UTCDateTime
-from unittest.mock import MagicMock
-
-Base = declarative_base()
-
-class TestModel(Base):
-    __tablename__ = "test_table"
-    id = Column(Integer, primary_key=True)
-    utc_datetime_col = Column(UTCDateTime)
+from types import SimpleNamespace
+from tests._testmodels import TestModel
 
 @pytest.fixture(scope="function")
-def db_session_custom_types():
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    try:
-        yield session
-    finally:
-        session.close()
-        Base.metadata.drop_all(engine)
+def db_session_custom_types(test_model_tables, sync_session):
+    return sync_session
 
 def test_utc_datetime_aware_to_db_and_back(db_session_custom_types):
     session = db_session_custom_types
@@ -79,10 +63,8 @@ def test_utc_datetime_process_bind_param_naive_explicit():
     utc_type = UTCDateTime()
     naive_dt = datetime(2023, 1, 1, 10, 0, 0) # Naive datetime
     
-    # Mock a dialect that is not sqlite to hit the else branch in load_dialect_impl
-    mock_dialect = MagicMock()
-    mock_dialect.name = 'postgresql'
-    mock_dialect.type_descriptor.return_value = MagicMock()
+    # Stub a dialect that is not sqlite to hit the else branch in load_dialect_impl
+    mock_dialect = SimpleNamespace(name='postgresql', type_descriptor=lambda impl: impl)
 
     # Test process_bind_param with naive datetime
     processed_value = utc_type.process_bind_param(naive_dt, mock_dialect)
@@ -94,10 +76,8 @@ def test_utc_datetime_process_result_value_naive_explicit():
     # Simulate a naive datetime coming from the database
     naive_db_dt = datetime(2023, 1, 1, 10, 0, 0) 
     
-    # Mock a dialect that is not sqlite
-    mock_dialect = MagicMock()
-    mock_dialect.name = 'postgresql'
-    mock_dialect.type_descriptor.return_value = MagicMock()
+    # Stub a dialect that is not sqlite
+    mock_dialect = SimpleNamespace(name='postgresql', type_descriptor=lambda impl: impl)
 
     # Test process_result_value with naive datetime from DB
     processed_value = utc_type.process_result_value(naive_db_dt, mock_dialect)
@@ -106,13 +86,14 @@ def test_utc_datetime_process_result_value_naive_explicit():
 
 def test_utc_datetime_load_dialect_impl_non_sqlite():
     utc_type = UTCDateTime()
-    mock_dialect = MagicMock()
-    mock_dialect.name = 'postgresql'
-    mock_dialect.type_descriptor.return_value = "mock_type_descriptor"
+    calls = []
+    def type_descriptor(impl):
+        calls.append(impl)
+        return "mock_type_descriptor"
+    mock_dialect = SimpleNamespace(name='postgresql', type_descriptor=type_descriptor)
 
     result = utc_type.load_dialect_impl(mock_dialect)
     assert result == "mock_type_descriptor"
-    mock_dialect.type_descriptor.assert_called_once()
-    args, kwargs = mock_dialect.type_descriptor.call_args
-    assert isinstance(args[0], UTCDateTime.impl)
-    assert args[0].timezone is True
\ No newline at end of file
+    assert len(calls) == 1
+    assert isinstance(calls[0], UTCDateTime.impl)
+    assert calls[0].timezone is True
\ No newline at end of file
@@ -1,11 +1,24 @@
 import pytest
-from sqlalchemy import select, inspect
-from datetime import datetime, timedelta
-import os
-import tempfile
+import uuid
+from sqlalchemy import bindparam, insert, select, inspect
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from datetime import datetime, timedelta, timezone
 
 from src.infrastructure.persistence.models.models import Vehicle, ParkingSpot, ParkingSession
-from src.infrastructure.persistence.database import init_db # Import init_db directly
+from src.infrastructure.persistence.database import init_db, create_sync_engine
+
+# One "recent" instant for every test; none of them depends on the clock moving
+NOW = datetime.now(timezone.utc)
+
+# Lookups shared by the tests below, built once with the filter value as a bound parameter
+VEHICLE_BY_ID = select(Vehicle).where(Vehicle.id == bindparam("id"))
+VEHICLE_BY_PLATE = select(Vehicle).where(Vehicle.license_plate == bindparam("license_plate"))
+SPOT_BY_NUMBER = select(ParkingSpot).where(ParkingSpot.spot_number == bindparam("spot_number"))
+AVAILABLE_SPOTS_BY_TYPE = select(ParkingSpot).where(
+    (ParkingSpot.spot_type == bindparam("spot_type")) & (ParkingSpot.is_occupied == False)
+)
+SESSION_BY_ID = select(ParkingSession).where(ParkingSession.id == bindparam("id"))
 
 
 class TestVehicleModel:
@@ -23,7 +36,7 @@ class TestVehicleModel:
         
         # Verify vehicle was created
         result = await db_session.execute(
-            select(Vehicle).where(Vehicle.license_plate == "XYZ789")
+            VEHICLE_BY_PLATE, {"license_plate": "XYZ789"}
         )
         saved_vehicle = result.scalar_one()
         
@@ -35,7 +48,7 @@ class TestVehicleModel:
     async def test_read_vehicle(self, sample_vehicle, db_session):
         """Test reading an existing vehicle."""
         result = await db_session.execute(
-            select(Vehicle).where(Vehicle.id == sample_vehicle.id)
+            VEHICLE_BY_ID, {"id": sample_vehicle.id}
         )
         vehicle = result.scalar_one()
         
@@ -50,7 +63,7 @@ class TestVehicleModel:
         
         # Verify update
         result = await db_session.execute(
-            select(Vehicle).where(Vehicle.id == sample_vehicle.id)
+            VEHICLE_BY_ID, {"id": sample_vehicle.id}
         )
         updated_vehicle = result.scalar_one()
         
@@ -75,7 +88,7 @@ class TestVehicleModel:
         
         # Verify deletion
         result = await db_session.execute(
-            select(Vehicle).where(Vehicle.id == vehicle_id)
+            VEHICLE_BY_ID, {"id": vehicle_id}
         )
         assert result.scalar_one_or_none() is None
     
@@ -88,8 +101,9 @@ class TestVehicleModel:
         )
         db_session.add(duplicate_vehicle)
         
-        with pytest.raises(Exception):  # IntegrityError
+        with pytest.raises(IntegrityError):
             await db_session.commit()
+        await db_session.rollback()
 
 
 class TestParkingSpotModel:
@@ -108,7 +122,7 @@ class TestParkingSpotModel:
         
         # Verify spot was created
         result = await db_session.execute(
-            select(ParkingSpot).where(ParkingSpot.spot_number == "4-01")
+            SPOT_BY_NUMBER, {"spot_number": "4-01"}
         )
         saved_spot = result.scalar_one()
         
@@ -134,7 +148,7 @@ class TestParkingSpotModel:
         """Test updating parking spot occupancy."""
         # Get first spot
         result = await db_session.execute(
-            select(ParkingSpot).where(ParkingSpot.spot_number == "1-01")
+            SPOT_BY_NUMBER, {"spot_number": "1-01"}
         )
         spot = result.scalar_one()
         
@@ -144,7 +158,7 @@ class TestParkingSpotModel:
         
         # Verify update
         result = await db_session.execute(
-            select(ParkingSpot).where(ParkingSpot.spot_number == "1-01")
+            SPOT_BY_NUMBER, {"spot_number": "1-01"}
         )
         updated_spot = result.scalar_one()
         
@@ -154,10 +168,7 @@ class TestParkingSpotModel:
         """Test querying available spots by type."""
         # Query available regular spots
         result = await db_session.execute(
-            select(ParkingSpot).where(
-                (ParkingSpot.spot_type == "regular") & 
-                (ParkingSpot.is_occupied == False)
-            )
+            AVAILABLE_SPOTS_BY_TYPE, {"spot_type": "regular"}
         )
         available_regular = result.scalars().all()
         
@@ -180,7 +191,7 @@ class TestParkingSessionModel:
         session = ParkingSession(
             vehicle_id=sample_vehicle.id,
             parking_spot_id=spot.id,
-            entry_time=datetime.utcnow(),
+            entry_time=NOW,
             hourly_rate=5.0
         )
         db_session.add(session)
@@ -193,14 +204,13 @@ class TestParkingSessionModel:
     
     async def test_read_parking_session_with_relationships(self, sample_parking_session, db_session):
         """Test reading a parking session with its relationships."""
+        # Load the relationships with the session instead of refreshing them afterwards
         result = await db_session.execute(
-            select(ParkingSession).where(ParkingSession.id == sample_parking_session.id)
+            SESSION_BY_ID.options(selectinload(ParkingSession.vehicle), selectinload(ParkingSession.parking_spot)),
+            {"id": sample_parking_session.id}
         )
         session = result.scalar_one()
         
-        # Load relationships
-        await db_session.refresh(session, ["vehicle", "parking_spot"])
-        
         assert session.vehicle.license_plate == "ABC123"
         assert session.parking_spot.spot_number == "1-01"
     
@@ -216,7 +226,7 @@ class TestParkingSessionModel:
         
         # Verify updates
         result = await db_session.execute(
-            select(ParkingSession).where(ParkingSession.id == sample_parking_session.id)
+            SESSION_BY_ID, {"id": sample_parking_session.id}
         )
         updated_session = result.scalar_one()
         
@@ -244,24 +254,17 @@ class TestParkingSessionModel:
     async def test_query_active_sessions(self, db_session, sample_vehicle, init_parking_spots):
         """Test querying active parking sessions."""
         # Create multiple sessions
-        spots = await db_session.execute(
-            select(ParkingSpot).where(ParkingSpot.is_occupied == False).limit(3)
-        )
-        spots = spots.scalars().all()
-        
-        # Create 2 active and 1 completed session
-        for i, spot in enumerate(spots):
-            session = ParkingSession(
-                vehicle_id=sample_vehicle.id,
-                parking_spot_id=spot.id,
-                entry_time=datetime.utcnow() - timedelta(hours=i)
-            )
-            if i == 2:  # Complete the third session
-                session.exit_time = datetime.utcnow()
-                session.payment_status = "paid"
-            
-            db_session.add(session)
-        
+        spot_ids = (await db_session.scalars(
+            select(ParkingSpot.id).where(ParkingSpot.is_occupied == False).limit(3)
+        )).all()
+        
+        # Create 2 active and 1 completed session in one executemany
+        rows = [
+            {"vehicle_id": sample_vehicle.id, "parking_spot_id": spot_id, "entry_time": NOW - timedelta(hours=i)}
+            for i, spot_id in enumerate(spot_ids)
+        ]
+        rows[2].update(exit_time=NOW, payment_status="paid")  # Complete the third session
+        await db_session.execute(insert(ParkingSession), rows)
         await db_session.commit()
         
         # Query active sessions
@@ -277,43 +280,10 @@ class TestParkingSessionModel:
 
 @pytest.fixture(scope="function")
 def init_db_fixture():
-    """Fixture to set up and tear down a clean in-memory database for init_db tests."""
-    # Temporarily override DATABASE_URL to ensure in-memory db for init_db
-    original_db_url = os.getenv("DATABASE_URL")
-    original_async_db_url = os.getenv("ASYNC_DATABASE_URL")
-    
-    # Use a temporary file for the test database to trigger the absolute path logic
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_file:
-        test_db_path = tmp_file.name
-    os.environ["DATABASE_URL"] = f"sqlite:///{test_db_path}"
-    os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{test_db_path}"
-
-    # Import database.database here to ensure it picks up the patched environment variables
-    # and re-initializes its global engine variables.
-    import src.infrastructure.persistence.database as database
-    import importlib
-    importlib.reload(database)
-
-    # Ensure tables are dropped before each test run
-    database.Base.metadata.drop_all(database.engine)
-
-    yield database.engine # Yield the engine for inspection
-
-    # Clean up after test
-    database.Base.metadata.drop_all(database.engine)
-    
-    if original_db_url:
-        os.environ["DATABASE_URL"] = original_db_url
-    else:
-        del os.environ["DATABASE_URL"]
-    
-    if original_async_db_url:
-        os.environ["ASYNC_DATABASE_URL"] = original_async_db_url
-    else:
-        del os.environ["ASYNC_DATABASE_URL"]
-    
-    # Reload database.database again to restore original settings
-    importlib.reload(database)
+    """Fixture providing an engine on a fresh in-memory database for the init_db tests."""
+    engine = create_sync_engine(f"sqlite:///file:init_db_{uuid.uuid4().hex}?mode=memory&cache=shared&uri=true")
+    yield engine
+    engine.dispose()
 
 
 class TestDatabaseFunctions:
@@ -324,16 +294,66 @@ class TestDatabaseFunctions:
         engine = init_db_fixture
         
         # Call init_db
-        init_db()
+        init_db(engine)
         
         # Verify tables exist
         inspector = inspect(engine)
         assert inspector.has_table("vehicles")
         assert inspector.has_table("parking_spots")
         assert inspector.has_table("parking_sessions")
+
+        session_indexes = {index["name"] for index in inspector.get_indexes("parking_sessions")}
+        assert {"ix_session_exit_paid", "ix_session_entry", "ix_session_active_entry"} <= session_indexes
+        spot_indexes = {index["name"] for index in inspector.get_indexes("parking_spots")}
+        assert "ix_spot_occupied_type" in spot_indexes
         
         # Verify initial parking spots are created
         from sqlalchemy.orm import Session
         with Session(engine) as session:
             spot_count = session.query(ParkingSpot).count()
             assert spot_count == 60 # 3 floors * 20 spots
+
+    def test_init_db_backfills_color_lc(self, init_db_fixture):
+        """Test that init_db adds and fills the normalized color column on a legacy vehicles table."""
+        from sqlalchemy import text
+        engine = init_db_fixture
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE vehicles (id INTEGER PRIMARY KEY, license_plate VARCHAR, "
+                "color VARCHAR NOT NULL, brand VARCHAR NOT NULL, created_at DATETIME)"
+            ))
+            conn.execute(text("INSERT INTO vehicles (license_plate, color, brand) VALUES ('OLD1', ' Red ', 'Ford')"))
+
+        init_db(engine)
+
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT color_lc FROM vehicles")).scalar() == "red"
+        assert "ix_vehicles_color_lc" in {index["name"] for index in inspect(engine).get_indexes("vehicles")}
+
+    def test_init_db_seeds_parking_stats_only_when_missing(self, init_db_fixture):
+        """Test that init_db seeds the counter row once and leaves it alone on later calls."""
+        from sqlalchemy import update
+        from sqlalchemy.orm import Session
+        from src.infrastructure.persistence.models.models import ParkingStats
+        engine = init_db_fixture
+
+        init_db(engine)
+        with Session(engine) as session:
+            assert session.get(ParkingStats, 1).current_occupancy == 0
+            # Stands in for an entry committed by another session between reruns
+            session.execute(update(ParkingStats).values(current_occupancy=7))
+            session.commit()
+
+        init_db(engine)
+        with Session(engine) as session:
+            assert session.get(ParkingStats, 1).current_occupancy == 7
+
+    def test_sqlite_connections_use_wal(self, tmp_path):
+        """Test that new SQLite connections are switched to WAL journaling."""
+        from sqlalchemy import text
+        # WAL only applies to database files; in-memory databases always report "memory"
+        engine = create_sync_engine(f"sqlite:///{tmp_path / 'parking.db'}")
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        engine.dispose()
@@ -2,16 +2,18 @@ from datetime import datetime, timedelta, timezone
 from src.domain.entities import Vehicle, ParkingSpot, ParkingSession
 from src.domain.common import SpotType, PaymentStatus
 
+# One "recent" instant for every test; none of them depends on the clock moving
+NOW = datetime.now(timezone.utc)
+
 
 def test_vehicle_creation():
     """Test that a Vehicle object can be created with correct attributes."""
-    now = datetime.now(timezone.utc)
-    vehicle = Vehicle(license_plate="TEST123", color="Red", brand="Toyota", id=1, created_at=now)
+    vehicle = Vehicle(license_plate="TEST123", color="Red", brand="Toyota", id=1, created_at=NOW)
     assert vehicle.id == 1
     assert vehicle.license_plate == "TEST123"
     assert vehicle.color == "Red"
     assert vehicle.brand == "Toyota"
-    assert vehicle.created_at == now
+    assert vehicle.created_at == NOW
 
 def test_vehicle_creation_defaults():
     """Test Vehicle creation with default optional arguments."""
@@ -35,7 +37,7 @@ def test_parking_spot_creation_defaults():
 
 def test_parking_session_creation():
     """Test that a ParkingSession object can be created with correct attributes."""
-    entry = datetime.now(timezone.utc)
+    entry = NOW
     session = ParkingSession(
         vehicle_id=1,
         parking_spot_id=101,
@@ -57,8 +59,8 @@ def test_parking_session_creation():
 
 def test_parking_session_creation_with_exit_and_payment():
     """Test ParkingSession creation with exit time and payment details."""
-    entry = datetime.now(timezone.utc) - timedelta(hours=2)
-    exit_time = datetime.now(timezone.utc)
+    entry = NOW - timedelta(hours=2)
+    exit_time = NOW
     session = ParkingSession(
         vehicle_id=2,
         parking_spot_id=102,
@@ -74,7 +76,7 @@ def test_parking_session_creation_with_exit_and_payment():
 
 def test_parking_session_creation_defaults():
     """Test ParkingSession creation with default optional arguments."""
-    entry = datetime.now(timezone.utc)
+    entry = NOW
     session = ParkingSession(
         vehicle_id=3,
         parking_spot_id=103,
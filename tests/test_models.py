@@ -1,30 +1,37 @@
 import pytest
 from datetime import datetime, timedelta, timezone
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import insert
 from src.infrastructure.persistence.models.models import Base, Vehicle, ParkingSpot, ParkingSession
 
+# One "recent" instant for every test; none of them depends on the clock moving
+NOW = datetime.now(timezone.utc)
+
+
+@pytest.fixture(scope="module")
+def model_tables(sync_engine):
+    Base.metadata.create_all(sync_engine)
+    yield
+    Base.metadata.drop_all(sync_engine)
+
 
 @pytest.fixture(scope="function")
-def db_session():
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    try:
-        yield session
-    finally:
-        session.close()
-        Base.metadata.drop_all(engine)
+def db_session(model_tables, sync_session):
+    return sync_session
+
+
+def insert_vehicle_and_spot(db_session, vehicle, spot):
+    """Insert a vehicle and a spot row and return their ids, with no ORM refresh round-trip."""
+    vehicle_id = db_session.scalar(insert(Vehicle).values(**vehicle).returning(Vehicle.id))
+    spot_id = db_session.scalar(insert(ParkingSpot).values(**spot).returning(ParkingSpot.id))
+    return vehicle_id, spot_id
 
 
 def test_vehicle_model(db_session):
     vehicle = Vehicle(
-        license_plate="TEST123", color="red", brand="Toyota", created_at=datetime.now(timezone.utc)
+        license_plate="TEST123", color="red", brand="Toyota", created_at=NOW
     )
     db_session.add(vehicle)
     db_session.commit()
-    db_session.refresh(vehicle)
 
     assert vehicle.id is not None
     assert vehicle.license_plate == "TEST123"
@@ -40,7 +47,6 @@ def test_parking_spot_model(db_session):
     )
     db_session.add(spot)
     db_session.commit()
-    db_session.refresh(spot)
 
     assert spot.id is not None
     assert spot.spot_number == "A1"
@@ -50,28 +56,26 @@ def test_parking_spot_model(db_session):
 
 
 def test_parking_session_model(db_session):
-    vehicle = Vehicle(license_plate="TEST456", color="blue", brand="Ford")
-    spot = ParkingSpot(spot_number="B2", floor=2)
-    db_session.add_all([vehicle, spot])
-    db_session.commit()
-    db_session.refresh(vehicle)
-    db_session.refresh(spot)
+    vehicle_id, spot_id = insert_vehicle_and_spot(
+        db_session,
+        {"license_plate": "TEST456", "color": "blue", "brand": "Ford"},
+        {"spot_number": "B2", "floor": 2},
+    )
 
-    entry_time = datetime.now(timezone.utc)
+    entry_time = NOW
     session = ParkingSession(
-        vehicle_id=vehicle.id,
-        parking_spot_id=spot.id,
+        vehicle_id=vehicle_id,
+        parking_spot_id=spot_id,
         entry_time=entry_time,
         hourly_rate=10.0,
         payment_status="pending",
     )
     db_session.add(session)
     db_session.commit()
-    db_session.refresh(session)
 
     assert session.id is not None
-    assert session.vehicle_id == vehicle.id
-    assert session.parking_spot_id == spot.id
+    assert session.vehicle_id == vehicle_id
+    assert session.parking_spot_id == spot_id
     assert session.entry_time == entry_time
     assert session.hourly_rate == 10.0
     assert session.payment_status == "pending"
@@ -79,78 +83,72 @@ def test_parking_session_model(db_session):
     assert session.amount_paid is None
 
     # Test relationships
-    assert session.vehicle == vehicle
-    assert session.parking_spot == spot
+    assert session.vehicle.license_plate == "TEST456"
+    assert session.parking_spot.spot_number == "B2"
 
 
 def test_parking_session_duration_hours_property(db_session):
-    vehicle = Vehicle(license_plate="TEST789", color="green", brand="BMW")
-    spot = ParkingSpot(spot_number="C3", floor=3)
-    db_session.add_all([vehicle, spot])
-    db_session.commit()
-    db_session.refresh(vehicle)
-    db_session.refresh(spot)
+    vehicle_id, spot_id = insert_vehicle_and_spot(
+        db_session,
+        {"license_plate": "TEST789", "color": "green", "brand": "BMW"},
+        {"spot_number": "C3", "floor": 3},
+    )
 
-    entry_time = datetime.now(timezone.utc) - timedelta(hours=2, minutes=30)
-    exit_time = datetime.now(timezone.utc)
+    exit_time = NOW
+    entry_time = exit_time - timedelta(hours=2, minutes=30)
 
     session = ParkingSession(
-        vehicle_id=vehicle.id,
-        parking_spot_id=spot.id,
+        vehicle_id=vehicle_id,
+        parking_spot_id=spot_id,
         entry_time=entry_time,
         exit_time=exit_time,
     )
     db_session.add(session)
     db_session.commit()
-    db_session.refresh(session)
 
     assert session.duration_hours == pytest.approx(2.5)
     assert session.calculate_amount == pytest.approx(12.5) # 2.5 hours * 5.0 hourly_rate (default)
 
 
 def test_parking_session_duration_hours_no_exit_time(db_session):
-    vehicle = Vehicle(license_plate="TEST000", color="yellow", brand="Audi")
-    spot = ParkingSpot(spot_number="D4", floor=4)
-    db_session.add_all([vehicle, spot])
-    db_session.commit()
-    db_session.refresh(vehicle)
-    db_session.refresh(spot)
+    vehicle_id, spot_id = insert_vehicle_and_spot(
+        db_session,
+        {"license_plate": "TEST000", "color": "yellow", "brand": "Audi"},
+        {"spot_number": "D4", "floor": 4},
+    )
 
-    entry_time = datetime.now(timezone.utc)
+    entry_time = NOW
     session = ParkingSession(
-        vehicle_id=vehicle.id,
-        parking_spot_id=spot.id,
+        vehicle_id=vehicle_id,
+        parking_spot_id=spot_id,
         entry_time=entry_time,
     )
     db_session.add(session)
     db_session.commit()
-    db_session.refresh(session)
 
     assert session.duration_hours is None
     assert session.calculate_amount is None
 
 
 def test_parking_session_calculate_amount_property_with_custom_rate(db_session):
-    vehicle = Vehicle(license_plate="TEST111", color="orange", brand="Mercedes")
-    spot = ParkingSpot(spot_number="E5", floor=5)
-    db_session.add_all([vehicle, spot])
-    db_session.commit()
-    db_session.refresh(vehicle)
-    db_session.refresh(spot)
+    vehicle_id, spot_id = insert_vehicle_and_spot(
+        db_session,
+        {"license_plate": "TEST111", "color": "orange", "brand": "Mercedes"},
+        {"spot_number": "E5", "floor": 5},
+    )
 
-    entry_time = datetime.now(timezone.utc) - timedelta(hours=3)
-    exit_time = datetime.now(timezone.utc)
+    exit_time = NOW
+    entry_time = exit_time - timedelta(hours=3)
 
     session = ParkingSession(
-        vehicle_id=vehicle.id,
-        parking_spot_id=spot.id,
+        vehicle_id=vehicle_id,
+        parking_spot_id=spot_id,
         entry_time=entry_time,
         exit_time=exit_time,
         hourly_rate=7.5
     )
     db_session.add(session)
     db_session.commit()
-    db_session.refresh(session)
 
     assert session.duration_hours == pytest.approx(3.0)
     assert session.calculate_amount == pytest.approx(22.5) # 3 hours * 7.5 hourly_rate
@@ -1,20 +1,9 @@
 import pytest
 from datetime import timedelta
-from freezegun import freeze_time
 
+from src.application.services.parking_service import ParkingService
 from src.domain.common import SpotType, PaymentStatus
-
-
-@pytest.fixture
-async def parked_vehicle(parking_service, init_parking_spots):
-    """Create a vehicle that's already parked."""
-    session_response = await parking_service.register_vehicle_entry(
-        license_plate="PARKED123",
-        color="Silver",
-        brand="Mercedes",
-        spot_type=SpotType.REGULAR
-    )
-    return session_response
+from src.shared.ttl_cache import TTLCache
 
 
 class TestParkingServiceVehicleEntry:
@@ -40,14 +29,8 @@ class TestParkingServiceVehicleEntry:
         assert response.entry_time is not None
         assert response.exit_time is None
         
-        # Verify database state
-        
-        # Check vehicle was created
-        vehicle = await parking_service.vehicle_repo.get_by_license_plate("NEW123")
-        assert vehicle is not None
-        
         # Check parking session was created
-        parking_session = await parking_service.parking_session_repo.get_active_session_by_license_plate("NEW123")
+        parking_session = await parking_service.parking_session_repo.get_by_id(response.id)
         assert parking_session.exit_time is None
         assert parking_session.payment_status == PaymentStatus.PENDING
     
@@ -130,9 +113,9 @@ class TestParkingServiceVehicleExit:
         """Test successful vehicle exit and payment calculation."""
         vehicle = await parking_service.vehicle_repo.get_by_id(parked_vehicle.vehicle_id)
         
-        # Mock exit time to be 2 hours after entry
-        with freeze_time(parked_vehicle.entry_time + timedelta(hours=2)):
-            payment_info = await parking_service.register_vehicle_exit(vehicle.license_plate)
+        # Exit 2 hours after entry
+        parking_service.clock = lambda: parked_vehicle.entry_time + timedelta(hours=2)
+        payment_info = await parking_service.register_vehicle_exit(vehicle.license_plate)
         
         # Verify payment calculation
         assert payment_info.vehicle_id == parked_vehicle.vehicle_id
@@ -155,9 +138,9 @@ class TestParkingServiceVehicleExit:
         """Test that minimum charge is 1 hour even for shorter stays."""
         vehicle = await parking_service.vehicle_repo.get_by_id(parked_vehicle.vehicle_id)
         
-        # Mock exit time to be 30 minutes after entry
-        with freeze_time(parked_vehicle.entry_time + timedelta(minutes=30)):
-            payment_info = await parking_service.register_vehicle_exit(vehicle.license_plate)
+        # Exit 30 minutes after entry
+        parking_service.clock = lambda: parked_vehicle.entry_time + timedelta(minutes=30)
+        payment_info = await parking_service.register_vehicle_exit(vehicle.license_plate)
         
         # Should charge for minimum 1 hour
         assert payment_info.amount_paid == 5.0  # 1 hour * 5.0 hourly rate
@@ -188,12 +171,9 @@ class TestParkingServiceStatus:
         assert status["occupied_spots"] == 0
         assert status["available_spots"] == 15
         assert status["occupancy_rate"] == 0.0
-        assert len(status["floors"]) == 3
-        
-        for floor_info in status["floors"]:
-            assert floor_info["total"] == 5
-            assert floor_info["occupied"] == 0
-            assert floor_info["available"] == 5
+        assert sorted(status["floors"], key=lambda f: f["floor"]) == [
+            {"floor": floor, "total": 5, "occupied": 0, "available": 5} for floor in (1, 2, 3)
+        ]
     
     async def test_get_parking_status_with_vehicles(self, parking_service, init_parking_spots):
         """Test parking status with some vehicles parked."""
@@ -213,6 +193,25 @@ class TestParkingServiceStatus:
         assert status["available_spots"] == 12
         assert status["occupancy_rate"] == 20.0  # 3/15 * 100
     
+    async def test_get_parking_status_cached_until_entry(self, parking_service, init_parking_spots):
+        """Test that a cached status is reused until a vehicle entry invalidates it."""
+        cached_service = ParkingService(
+            parking_service.vehicle_repo,
+            parking_service.parking_spot_repo,
+            parking_service.parking_session_repo,
+            cache=TTLCache()
+        )
+        before = await cached_service.get_parking_status()
+
+        await parking_service.parking_spot_repo.update_all_occupied_by_type("vip", True)
+        assert await cached_service.get_parking_status() == before
+
+        await cached_service.register_vehicle_entry(
+            license_plate="CACHE1", color="Red", brand="Toyota", spot_type=SpotType.REGULAR
+        )
+        status = await cached_service.get_parking_status()
+        assert status["occupied_spots"] == 4  # 3 VIP spots + the new entry
+    
     async def test_get_active_sessions(self, parking_service, init_parking_spots):
         """Test getting all active parking sessions."""
         # Park 2 vehicles
@@ -18,6 +18,15 @@ from src.infrastructure.api.schemas.parking import (
 )
 from src.domain.common import SpotType, PaymentStatus
 
+# One "recent" instant for every test; none of them depends on the clock moving
+NOW = datetime.now(timezone.utc)
+
+# Nested objects for the session-response tests, which only need them to be valid
+VEHICLE_RESPONSE = VehicleResponse(
+    id=1, license_plate="test-1", color="red", brand="test", created_at=NOW
+)
+SPOT_RESPONSE = ParkingSpotResponse(id=1, spot_number="C3", floor=3, is_occupied=False)
+
 
 def test_spot_type_enum():
     assert SpotType.REGULAR == "regular"
@@ -30,56 +39,51 @@ def test_payment_status_enum():
     assert PaymentStatus.PAID == "paid"
 
 
-def test_vehicle_base_valid():
-    vehicle = VehicleBase(license_plate="abc-123", color="red", brand="honda")
+@pytest.mark.parametrize(
+    "model, extra",
+    [
+        (VehicleBase, {}),
+        (VehicleCreate, {}),
+        (VehicleResponse, {"id": 1, "created_at": NOW}),
+    ],
+    ids=["base", "create", "response"],
+)
+def test_vehicle_models_valid(model, extra):
+    vehicle = model(license_plate="abc-123", color="red", brand="honda", **extra)
     assert vehicle.license_plate == "ABC-123"
     assert vehicle.color == "red"
     assert vehicle.brand == "honda"
+    for field, value in extra.items():
+        assert getattr(vehicle, field) == value
 
 
-def test_vehicle_base_license_plate_validation():
-    with pytest.raises(ValidationError):
-        VehicleBase(license_plate="", color="red", brand="honda")
+@pytest.mark.parametrize("bad_plate", ["", "a" * 21], ids=["empty", "too_long"])
+def test_vehicle_base_license_plate_validation(bad_plate):
     with pytest.raises(ValidationError):
-        VehicleBase(license_plate="a" * 21, color="red", brand="honda")
-
+        VehicleBase(license_plate=bad_plate, color="red", brand="honda")
 
-def test_vehicle_create_valid():
-    vehicle_create = VehicleCreate(license_plate="xyz-789", color="blue", brand="ford")
-    assert vehicle_create.license_plate == "XYZ-789"
 
-
-def test_vehicle_response_valid():
-    now = datetime.now(timezone.utc)
-    vehicle_response = VehicleResponse(
-        id=1, license_plate="def-456", color="green", brand="toyota", created_at=now
-    )
-    assert vehicle_response.id == 1
-    assert vehicle_response.license_plate == "DEF-456"
-    assert vehicle_response.created_at == now
-
-
-def test_parking_spot_base_valid():
-    spot = ParkingSpotBase(spot_number="A1", floor=1, spot_type=SpotType.REGULAR)
-    assert spot.spot_number == "A1"
-    assert spot.floor == 1
-    assert spot.spot_type == SpotType.REGULAR
+@pytest.mark.parametrize(
+    "model, extra",
+    [
+        (ParkingSpotBase, {}),
+        (ParkingSpotResponse, {"id": 1, "is_occupied": True}),
+    ],
+    ids=["base", "response"],
+)
+def test_parking_spot_models_valid(model, extra):
+    spot = model(spot_number="B2", floor=2, spot_type=SpotType.DISABLED, **extra)
+    assert spot.spot_number == "B2"
+    assert spot.floor == 2
+    assert spot.spot_type == SpotType.DISABLED
+    for field, value in extra.items():
+        assert getattr(spot, field) == value
 
 
-def test_parking_spot_base_floor_validation():
+@pytest.mark.parametrize("bad_floor", [0, 11], ids=["below_min", "above_max"])
+def test_parking_spot_base_floor_validation(bad_floor):
     with pytest.raises(ValidationError):
-        ParkingSpotBase(spot_number="A1", floor=0)
-    with pytest.raises(ValidationError):
-        ParkingSpotBase(spot_number="A1", floor=11)
-
-
-def test_parking_spot_response_valid():
-    spot_response = ParkingSpotResponse(
-        id=1, spot_number="B2", floor=2, spot_type=SpotType.DISABLED, is_occupied=True
-    )
-    assert spot_response.id == 1
-    assert spot_response.spot_number == "B2"
-    assert spot_response.is_occupied is True
+        ParkingSpotBase(spot_number="A1", floor=bad_floor)
 
 
 def test_vehicle_entry_valid():
@@ -100,96 +104,72 @@ def test_vehicle_exit_valid():
     assert exit_data.license_plate == "MNO-111"
 
 
-def test_parking_session_base_valid():
-    now = datetime.now(timezone.utc)
-    session = ParkingSessionBase(
-        vehicle_id=1, parking_spot_id=1, entry_time=now, hourly_rate=10.0
-    )
+@pytest.mark.parametrize(
+    "model", [ParkingSessionBase, ParkingSessionCreate], ids=["base", "create"]
+)
+def test_parking_session_models_valid(model):
+    session = model(vehicle_id=1, parking_spot_id=2, entry_time=NOW, hourly_rate=10.0)
     assert session.vehicle_id == 1
-    assert session.parking_spot_id == 1
-    assert session.entry_time == now
+    assert session.parking_spot_id == 2
+    assert session.entry_time == NOW
     assert session.hourly_rate == 10.0
 
 
-def test_parking_session_create_valid():
-    now = datetime.now(timezone.utc)
-    session_create = ParkingSessionCreate(
-        vehicle_id=2, parking_spot_id=2, entry_time=now
-    )
-    assert session_create.vehicle_id == 2
-
-
 def test_parking_session_response_valid():
-    now = datetime.now(timezone.utc)
-    exit_time = now + timedelta(hours=2)
-    vehicle_response = VehicleResponse(
-        id=1, license_plate="test-1", color="red", brand="test", created_at=now
-    )
-    parking_spot_response = ParkingSpotResponse(
-        id=1, spot_number="C3", floor=3, is_occupied=False
-    )
+    exit_time = NOW + timedelta(hours=2)
     session_response = ParkingSessionResponse(
         id=1,
         vehicle_id=1,
         parking_spot_id=1,
-        entry_time=now,
+        entry_time=NOW,
         exit_time=exit_time,
         amount_paid=20.0,
         payment_status=PaymentStatus.PAID,
-        vehicle=vehicle_response,
-        parking_spot=parking_spot_response,
+        vehicle=VEHICLE_RESPONSE,
+        parking_spot=SPOT_RESPONSE,
     )
     assert session_response.id == 1
     assert session_response.exit_time == exit_time
     assert session_response.amount_paid == 20.0
     assert session_response.payment_status == PaymentStatus.PAID
-    assert session_response.vehicle == vehicle_response
-    assert session_response.parking_spot == parking_spot_response
+    assert session_response.vehicle == VEHICLE_RESPONSE
+    assert session_response.parking_spot == SPOT_RESPONSE
 
 
 def test_parking_session_response_datetime_awareness():
     # Test with naive datetime
-    naive_dt = datetime.now()
+    naive_dt = NOW.replace(tzinfo=None)
     session_response = ParkingSessionResponse(
         id=1,
         vehicle_id=1,
         parking_spot_id=1,
         entry_time=naive_dt,
         payment_status=PaymentStatus.PENDING,
-        vehicle=VehicleResponse(
-            id=1, license_plate="test-1", color="red", brand="test", created_at=naive_dt
-        ),
-        parking_spot=ParkingSpotResponse(
-            id=1, spot_number="C3", floor=3, is_occupied=False
-        ),
+        vehicle=VEHICLE_RESPONSE,
+        parking_spot=SPOT_RESPONSE,
     )
     assert session_response.entry_time.tzinfo == timezone.utc
 
     # Test with aware datetime
-    aware_dt = datetime.now(timezone.utc)
+    aware_dt = NOW
     session_response = ParkingSessionResponse(
         id=1,
         vehicle_id=1,
         parking_spot_id=1,
         entry_time=aware_dt,
         payment_status=PaymentStatus.PENDING,
-        vehicle=VehicleResponse(
-            id=1, license_plate="test-1", color="red", brand="test", created_at=aware_dt
-        ),
-        parking_spot=ParkingSpotResponse(
-            id=1, spot_number="C3", floor=3, is_occupied=False
-        ),
+        vehicle=VEHICLE_RESPONSE,
+        parking_spot=SPOT_RESPONSE,
     )
     assert session_response.entry_time == aware_dt
 
 
 def test_payment_info_valid():
-    now = datetime.now(timezone.utc)
-    exit_time = now + timedelta(hours=1)
+    exit_time = NOW + timedelta(hours=1)
     payment_info = PaymentInfo(
         session_id=1,
         license_plate="xyz-789",
-        entry_time=now,
+        entry_time=NOW,
         exit_time=exit_time,
         duration_hours=1.0,
         amount_due=5.0,
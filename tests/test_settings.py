@@ -1,38 +1,42 @@
-from src.config.settings_env import Settings
-import os
-from unittest.mock import patch
-from loguru import logger as loguru_logger
+import pytest
+
+from src.config.settings_env import Settings, settings
+from src.shared.utils import initialize_logger
+
+# loguru's numeric levels for TRACE and INFO
+TRACE_NO = 5
+INFO_NO = 20
 
 
 def test_settings():
     Settings()
 
 
-def test_initialize_logger_dev_mode():
-    with patch.dict(os.environ, {"DEV_MODE": "True"}):
-        # Reload settings_env to pick up the patched environment variable
-        import src.config.settings_env as settings_env
-        import importlib
-        importlib.reload(settings_env)
-        
-        # Reload utils to re-initialize the logger with new settings
-        import src.shared.utils
-        importlib.reload(src.shared.utils)
-        
-        logger = src.shared.utils.initialize_logger()
-        assert logger.level("TRACE").no == loguru_logger.level("TRACE").no
-
-
-def test_initialize_logger_prod_mode():
-    with patch.dict(os.environ, {"DEV_MODE": "False"}):
-        # Reload settings_env to pick up the patched environment variable
-        import src.config.settings_env as settings_env
-        import importlib
-        importlib.reload(settings_env)
-        
-        # Reload utils to re-initialize the logger with new settings
-        import src.shared.utils
-        importlib.reload(src.shared.utils)
-        
-        logger = src.shared.utils.initialize_logger()
-        assert logger.level("INFO").no == loguru_logger.level("INFO").no
\ No newline at end of file
+def test_settings_dev_mode_from_env(monkeypatch):
+    monkeypatch.setenv("DEV_MODE", "False")
+    assert Settings().DEV_MODE is False
+
+
+@pytest.fixture
+def stderr_logger(capsys):
+    """Return a helper that configures the logger and reports which levels reached stderr."""
+
+    def emitted_levels(config):
+        logger = initialize_logger(config)
+        logger.log(TRACE_NO, "trace-probe")
+        logger.log(INFO_NO, "info-probe")
+        logger.complete()  # flush the enqueued records
+        err = capsys.readouterr().err
+        return {level for level, probe in ((TRACE_NO, "trace-probe"), (INFO_NO, "info-probe")) if probe in err}
+
+    yield emitted_levels
+    # Point the sink back at the real stderr rather than the closed capture stream
+    initialize_logger(settings)
+
+
+def test_initialize_logger_dev_mode(stderr_logger):
+    assert stderr_logger(Settings(DEV_MODE=True)) == {TRACE_NO, INFO_NO}
+
+
+def test_initialize_logger_prod_mode(stderr_logger):
+    assert stderr_logger(Settings(DEV_MODE=False)) == {INFO_NO}
@@ -0,0 +1,79 @@
+import asyncio
+from unittest.mock import patch
+
+from src.shared import ttl_cache
+
+
+def setup_function():
+    ttl_cache.invalidate()
+
+
+def test_cached_reuses_value_until_expiry():
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    with patch("src.shared.ttl_cache.time.monotonic", return_value=100.0):
+        assert ttl_cache.cached("key", 5, compute) == 1
+        assert ttl_cache.cached("key", 5, compute) == 1
+
+    with patch("src.shared.ttl_cache.time.monotonic", return_value=106.0):
+        assert ttl_cache.cached("key", 5, compute) == 2
+
+    assert len(calls) == 2
+
+
+def test_invalidate_forces_recompute():
+    assert ttl_cache.cached("key", 60, lambda: "old") == "old"
+    ttl_cache.invalidate()
+    assert ttl_cache.cached("key", 60, lambda: "new") == "new"
+
+
+def test_invalidate_during_compute_is_not_cached():
+    def compute():
+        # An entry commits and invalidates while this read is in flight
+        ttl_cache.invalidate()
+        return "stale"
+
+    assert ttl_cache.cached("key", 60, compute) == "stale"
+    assert ttl_cache.cached("key", 60, lambda: "fresh") == "fresh"
+
+
+def test_cached_values_are_copies():
+    ttl_cache.cached("key", 60, lambda: {"spots": [1, 2]})["spots"].append(3)
+    assert ttl_cache.cached("key", 60, lambda: {}) == {"spots": [1, 2]}
+
+
+async def test_cached_async_reuses_value_until_invalidated():
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert await ttl_cache.stats_cache.cached_async("key", 60, compute) == 1
+    assert await ttl_cache.stats_cache.cached_async("key", 60, compute) == 1
+    ttl_cache.invalidate()
+    assert await ttl_cache.stats_cache.cached_async("key", 60, compute) == 2
+
+
+async def test_cached_async_invalidate_during_compute_is_not_cached():
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def slow_read():
+        started.set()
+        await release.wait()
+        return "stale"
+
+    read = asyncio.create_task(ttl_cache.stats_cache.cached_async("key", 60, slow_read))
+    await started.wait()
+    ttl_cache.invalidate()  # the entry's post-commit invalidation
+    release.set()
+    assert await read == "stale"
+
+    async def fresh_read():
+        return "fresh"
+
+    assert await ttl_cache.stats_cache.cached_async("key", 60, fresh_read) == "fresh"